@@ -4,19 +4,34 @@ Jail Custody Checker - Check defendant custody status in Dorchester County jail.
 
 __version__ = "1.0.0"
 
-from .models import Defendant, CustodyResult, CustodyReport
-from .parsers import parse_file, parse_csv_file, parse_pdf_file
-from .jail_api import JailAPIClient
-from .reports import generate_json_report, generate_excel_report
-
-__all__ = [
-    "Defendant",
-    "CustodyResult",
-    "CustodyReport",
-    "parse_file",
-    "parse_csv_file",
-    "parse_pdf_file",
-    "JailAPIClient",
-    "generate_json_report",
-    "generate_excel_report",
-]
+import importlib
+
+# Public names are resolved on first access (PEP 562) so that importing one
+# symbol doesn't pull in pdfplumber, openpyxl and requests all at once.
+_EXPORTS = {
+    "Defendant": ".models",
+    "CustodyResult": ".models",
+    "CustodyReport": ".models",
+    "Status": ".models",
+    "parse_file": ".parsers",
+    "parse_csv_file": ".parsers",
+    "parse_pdf_file": ".parsers",
+    "JailAPIClient": ".jail_api",
+    "generate_json_report": ".reports",
+    "generate_excel_report": ".reports",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
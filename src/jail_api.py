@@ -4,21 +4,24 @@ API client for querying Dorchester County jail database.
 Uses the reverse-engineered Southern Software Citizen Connect API.
 """
 
+import os
 import re
+import json
 import time
 import logging
-from typing import Optional, List, Dict
+from pathlib import Path
+from typing import Optional, List, Dict, NamedTuple, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
+from collections import deque
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from models import Defendant, CustodyResult
+from models import Defendant, CustodyResult, name_key
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application (see main.py), not the library
 logger = logging.getLogger(__name__)
 
 # API configuration
@@ -29,11 +32,58 @@ DEFAULT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.9',
-    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Encoding': 'gzip',  # Decoded by urllib3's C zlib path; no brotli dependency
     'Connection': 'keep-alive',
     'Referer': JAIL_API_MAIN_PAGE,
 }
 DEFAULT_DELAY_SECONDS = 0.5  # Delay between requests to be respectful
+DEFAULT_MAX_WORKERS = 3  # Concurrent page fetches allowed per delay window
+MAX_PAGES = 60  # Upper bound on confinement pages requested in one load
+CACHE_TTL_SECONDS = 600  # Confinement data changes on the order of hours
+# Per-user, owner-only location: never load cache files other users could write
+CACHE_DIR = Path.home() / ".cache" / "jail-checker"
+CACHE_PATH = CACHE_DIR / "inmates.json"
+
+# Inmate records indexed by models.name_key(last name, first name)
+InmateIndex = Dict[Tuple[str, str], List[Dict]]
+
+
+class PageCount(NamedTuple):
+    """Number of result pages read from a confinements page."""
+    pages: int
+    exact: bool  # From the result total; link-derived counts may only cover a window of pages
+
+
+# Precompiled XPath selectors for booking card extraction
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_XP_CARDS = etree.XPath(f"//div[{_HAS_CLASS.format('booking-card')}]", smart_strings=False)
+_XP_NAME = etree.XPath("string((.//h5)[1])", smart_strings=False)
+_XP_DETAIL_ROWS = etree.XPath(f".//div[{_HAS_CLASS.format('detail-row')}]", smart_strings=False)
+# Labels may wrap an icon and indentation, so read all their text with string()
+_XP_LABEL = etree.XPath(f"string((.//span[{_HAS_CLASS.format('detail-label')}])[1])", smart_strings=False)
+_XP_VALUE = etree.XPath(f"string((.//span[{_HAS_CLASS.format('detail-value')}])[1])", smart_strings=False)
+_XP_CHARGE_ITEMS = etree.XPath(f".//div[{_HAS_CLASS.format('charge-item')}]", smart_strings=False)
+_XP_CHARGE = etree.XPath(f"string(((.//div[{_HAS_CLASS.format('charge-details')}])[1]//div)[1])", smart_strings=False)
+_XP_MUGSHOT = etree.XPath(f"(.//img[{_HAS_CLASS.format('booking-mugshot')}])[1]/@src", smart_strings=False)
+_XP_DETAILS_HREF = etree.XPath("(.//a[contains(@href, 'BookingID=')])[1]/@href", smart_strings=False)
+_XP_RESULT_TOTAL = etree.XPath(
+    f"string((//h5[{_HAS_CLASS.format('text-muted')}]/span[{_HAS_CLASS.format('text-primary')}])[1])",
+    smart_strings=False
+)
+_XP_PAGE_LINKS = etree.XPath(f"//ul[{_HAS_CLASS.format('pagination')}]//a", smart_strings=False)
+_BOOKING_ID_RE = re.compile(r'BookingID=(\d+)')
+
+# Form body for the confinements POST; only the trailing page index varies
+_PAYLOAD_PREFIX = b'JMSAgencyID=SC018013C&search=&agency=&sort=name&IDX='
+_FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+# Booking card detail labels (whitespace collapsed, trailing colon dropped) mapped to inmate record fields
+_LABEL_FIELDS = {
+    'Booked': 'booking_date',
+    'Arrest Date/Time': 'arrest_datetime',
+    'Arresting Agency': 'arresting_agency',
+    'Bond Total': 'bond_amount',
+}
 
 
 class JailAPIClient:
@@ -49,7 +99,9 @@ class JailAPIClient:
         self,
         delay_seconds: float = DEFAULT_DELAY_SECONDS,
         max_retries: int = 3,
-        timeout: int = 30
+        timeout: int = 30,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        use_cache: bool = True
     ):
         """
         Initialize the jail API client.
@@ -61,20 +113,25 @@ class JailAPIClient:
         5
 
         Args:
-            delay_seconds: Seconds to wait between requests (default 0.5)
+            delay_seconds: Seconds each request slot waits before reuse (default 0.5)
             max_retries: Maximum number of retry attempts (default 3)
             timeout: Request timeout in seconds (default 30)
+            max_workers: Number of concurrent page fetches (default 3)
+            use_cache: Reuse confinements saved to disk within CACHE_TTL_SECONDS (default True)
         """
         self.delay_seconds = delay_seconds
         self.max_retries = max_retries
         self.timeout = timeout
-        self.last_request_time = 0
+        self.max_workers = max(1, max_workers)
+        self.use_cache = use_cache
 
-        # Thread-safe rate limiting
+        # Thread-safe rate limiting: timestamps of the last max_workers requests
         self._rate_limit_lock = Lock()
+        self._request_times = deque(maxlen=self.max_workers)
 
-        # Cache for current confinements
-        self._current_inmates: Optional[Dict[str, Dict]] = None
+        # Cache for current confinements, or the error that stopped them loading
+        self._current_inmates: Optional[InmateIndex] = None
+        self._load_error: Optional[Exception] = None
 
         # Create session with retry logic
         self.session = requests.Session()
@@ -86,7 +143,13 @@ class JailAPIClient:
             backoff_factor=2
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Size the pool to the page-fetch concurrency so every worker keeps its own keep-alive socket
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=4,
+            pool_maxsize=self.max_workers + 1,
+            pool_block=True
+        )
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
@@ -99,23 +162,31 @@ class JailAPIClient:
         """
         Enforce rate limiting by waiting if necessary (thread-safe).
 
-        >>> client = JailAPIClient(delay_seconds=0.1)
+        Token bucket: up to max_workers requests may start within any
+        delay_seconds window, so concurrent workers are not serialized.
+
+        >>> client = JailAPIClient(delay_seconds=0.1, max_workers=2)
         >>> import time
         >>> start = time.time()
         >>> client._respect_rate_limit()
         >>> client._respect_rate_limit()
+        >>> time.time() - start < 0.1  # Both slots available immediately
+        True
+        >>> client._respect_rate_limit()
         >>> elapsed = time.time() - start
-        >>> elapsed >= 0.1  # Should have waited at least delay_seconds
+        >>> elapsed >= 0.1  # Third request waited for the oldest slot
         True
         """
         with self._rate_limit_lock:
-            if self.last_request_time > 0:
-                elapsed = time.time() - self.last_request_time
+            now = time.monotonic()
+            if len(self._request_times) == self.max_workers:
+                elapsed = now - self._request_times[0]
                 if elapsed < self.delay_seconds:
                     sleep_time = self.delay_seconds - elapsed
-                    logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+                    logger.debug("Rate limiting: sleeping for %.2f seconds", sleep_time)
                     time.sleep(sleep_time)
-            self.last_request_time = time.time()
+                    now = time.monotonic()
+            self._request_times.append(now)
 
     def _ensure_session_initialized(self):
         """Ensure session is initialized by visiting main page once."""
@@ -124,16 +195,8 @@ class JailAPIClient:
 
         try:
             logger.info("Initializing session with jail database...")
-            # Simple GET request without retries to avoid triggering rate limits
-            response = requests.get(
-                JAIL_API_MAIN_PAGE,
-                headers=DEFAULT_HEADERS,
-                timeout=self.timeout,
-                cookies=self.session.cookies
-            )
-            # Transfer any cookies to our session
-            for cookie in response.cookies:
-                self.session.cookies.set_cookie(cookie)
+            # Go through the session so the TLS connection and cookies are reused by the page POSTs
+            self.session.get(JAIL_API_MAIN_PAGE, timeout=self.timeout)
 
             self._session_initialized = True
             logger.info("Session initialized successfully")
@@ -141,59 +204,83 @@ class JailAPIClient:
             logger.error(f"Failed to initialize session: {str(e)}")
             raise
 
-    def _fetch_single_page(self, page_idx: int) -> Dict[str, Dict]:
+    def _fetch_single_page(self, page_idx: int) -> Tuple[InmateIndex, Optional[PageCount]]:
         """
-        Fetch a single page of current confinements.
+        Fetch and parse a single page of current confinements.
 
         Args:
             page_idx: Page number to fetch (1-indexed)
 
         Returns:
-            Dictionary mapping normalized names to inmate details for this page
+            Tuple of (inmate records on this page indexed by name key,
+            page count if the page reports one)
         """
-        self._respect_rate_limit()
+        return self._parse_page(page_idx, self._download_page(page_idx))
 
-        payload = {
-            'JMSAgencyID': 'SC018013C',
-            'search': '',
-            'agency': '',
-            'sort': 'name',
-            'IDX': str(page_idx)
-        }
+    def _download_page(self, page_idx: int) -> bytes:
+        """
+        Download the raw HTML of a single page of current confinements.
 
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-        }
+        Args:
+            page_idx: Page number to fetch (1-indexed)
+
+        Returns:
+            Response body
+
+        Raises:
+            RuntimeError: If the server did not return 200 (after retries)
+        """
+        self._respect_rate_limit()
+
+        payload = _PAYLOAD_PREFIX + str(page_idx).encode('ascii')
 
         response = self.session.post(
             JAIL_API_CONFINEMENTS,
             data=payload,
-            headers=headers,
+            headers=_FORM_HEADERS,
             timeout=self.timeout
         )
 
         if response.status_code != 200:
-            logger.warning(f"Page {page_idx} returned status {response.status_code}")
-            return {}
+            raise RuntimeError(f"Page {page_idx} returned status {response.status_code}")
+
+        return response.content
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+    def _parse_page(self, page_idx: int, html_bytes: bytes) -> Tuple[InmateIndex, Optional[PageCount]]:
+        """
+        Parse booking cards out of a downloaded confinements page.
+
+        Args:
+            page_idx: Page number the HTML came from (for logging)
+            html_bytes: Raw page HTML
+
+        Returns:
+            Tuple of (inmate records on this page indexed by name key,
+            page count if the page reports one)
+        """
+        if not html_bytes:
+            logger.debug("No inmates found on page %d", page_idx)
+            return {}, None
+
+        # lxml parsers must not be shared between threads, so build one per page
+        parser = lxml_html.HTMLParser(encoding='utf-8')
+        document = lxml_html.document_fromstring(html_bytes, parser=parser)
 
         # Find all booking cards
-        booking_cards = soup.find_all('div', class_='booking-card')
+        booking_cards = _XP_CARDS(document)
         if not booking_cards:
-            logger.debug(f"No inmates found on page {page_idx}")
-            return {}
+            logger.debug("No inmates found on page %d", page_idx)
+            return {}, None
 
-        logger.info(f"Page {page_idx}: Found {len(booking_cards)} inmates")
+        logger.info("Page %d: Found %d inmates", page_idx, len(booking_cards))
 
         inmates = {}
         for card in booking_cards:
             try:
                 # Extract name from header
-                header = card.find('h5')
-                if not header:
+                full_name = _XP_NAME(card).strip()
+                if not full_name:
                     continue
-                full_name = header.get_text().strip()
 
                 # Parse name components
                 name_parts = full_name.split()
@@ -204,159 +291,359 @@ class JailAPIClient:
                 last_name = name_parts[-1]
                 middle_name = ' '.join(name_parts[1:-1]) if len(name_parts) > 2 else ''
 
-                # Extract all detail fields
-                detail_rows = card.find_all('div', class_='detail-row')
-                booking_date = None
-                arrest_datetime = None
-                arresting_agency = None
-                bond_amount = None
-
-                for row in detail_rows:
-                    label_elem = row.find('span', class_='detail-label')
-                    value_elem = row.find('span', class_='detail-value')
-                    if label_elem and value_elem:
-                        label = label_elem.get_text().strip()
-                        value = value_elem.get_text().strip()
-
-                        if 'Booked:' in label:
-                            booking_date = value
-                        elif 'Arrest Date/Time:' in label:
-                            arrest_datetime = value
-                        elif 'Arresting Agency:' in label:
-                            arresting_agency = value
-                        elif 'Bond Total:' in label:
-                            bond_amount = value
-
-                # Extract charges
-                charges_list = []
-                charge_items = card.find_all('div', class_='charge-item')
-                for item in charge_items:
-                    charge_details = item.find('div', class_='charge-details')
-                    if charge_details:
-                        # Get first div text (the charge description)
-                        charge_text = charge_details.find('div')
-                        if charge_text:
-                            charges_list.append(charge_text.get_text().strip())
-                charges = '; '.join(charges_list) if charges_list else None
+                # One record per inmate; detail fields default to None until found
+                inmate_data = {
+                    'full_name': full_name,
+                    'first_name': first_name,
+                    'middle_name': middle_name,
+                    'last_name': last_name,
+                    'booking_date': None,
+                    'arrest_datetime': None,
+                    'arresting_agency': None,
+                    'bond_amount': None,
+                }
+
+                # Extract the detail fields we keep; other rows are skipped without reading their value
+                for row in _XP_DETAIL_ROWS(card):
+                    label = ' '.join(_XP_LABEL(row).split()).rstrip(':').rstrip()
+                    field = _LABEL_FIELDS.get(label)
+                    if field:
+                        inmate_data[field] = _XP_VALUE(row).strip()
+
+                # Extract charges (first div of each charge's details is the description)
+                charges_list = [
+                    text for text in (_XP_CHARGE(item).strip() for item in _XP_CHARGE_ITEMS(card))
+                    if text
+                ]
+                inmate_data['charges'] = '; '.join(charges_list) if charges_list else None
 
                 # Extract mugshot URL
-                mugshot_img = card.find('img', class_='booking-mugshot')
-                mugshot_url = mugshot_img.get('src') if mugshot_img else None
+                mugshot_src = _XP_MUGSHOT(card)
+                inmate_data['mugshot_url'] = mugshot_src[0] if mugshot_src else None
 
                 # Extract booking ID from "View Full Details" link
-                details_link = card.find('a', href=re.compile(r'BookingID='))
+                details_href = _XP_DETAILS_HREF(card)
                 booking_number = None
-                if details_link:
-                    href = details_link.get('href', '')
-                    booking_match = re.search(r'BookingID=(\d+)', href)
+                if details_href:
+                    booking_match = _BOOKING_ID_RE.search(details_href[0])
                     if booking_match:
                         booking_number = booking_match.group(1)
 
-                # Create multiple lookup keys for matching flexibility
-                keys = [
-                    self._normalize_name(last_name, first_name, middle_name),
-                    self._normalize_name(last_name, first_name, ''),  # Without middle
-                ]
+                inmate_data['booking_number'] = booking_number
 
-                inmate_data = {
-                    'full_name': full_name,
-                    'first_name': first_name,
-                    'middle_name': middle_name,
-                    'last_name': last_name,
-                    'booking_date': booking_date,
-                    'arrest_datetime': arrest_datetime,
-                    'arresting_agency': arresting_agency,
-                    'bond_amount': bond_amount,
-                    'charges': charges,
-                    'mugshot_url': mugshot_url,
-                    'booking_number': booking_number,
-                }
-
-                for key in keys:
-                    inmates[key] = inmate_data
+                # Store each inmate once; middle names are compared at lookup time
+                inmates.setdefault(name_key(last_name, first_name), []).append(inmate_data)
 
             except Exception as e:
-                logger.warning(f"Error parsing booking card on page {page_idx}: {str(e)}")
+                logger.warning("Error parsing booking card on page %d: %s", page_idx, e)
                 continue
 
-        return inmates
+        return inmates, self._extract_page_count(document, len(booking_cards))
 
-    def _fetch_current_confinements(self) -> Dict[str, Dict]:
+    def _fetch_current_confinements(self) -> InmateIndex:
         """
         Fetch ALL pages of current confinements using parallel requests.
 
+        Page 1 is fetched first; when its result total says how many pages
+        exist, exactly the remaining pages are requested. Otherwise pages up to
+        the last page link shown are fetched and later pages are probed in
+        batches until a whole batch comes back empty, stopping at MAX_PAGES.
+
         Returns:
-            Dictionary mapping normalized names to inmate details
+            Inmate records indexed by (last name, first name)
+
+        Raises:
+            RuntimeError: If the confinements could not be loaded
         """
         if self._current_inmates is not None:
             return self._current_inmates
 
+        if self.use_cache:
+            cached = self._load_cached_inmates()
+            if cached is not None:
+                self._current_inmates = cached
+                return cached
+
+        # A failed first load is not retried for every defendant checked
+        if self._load_error is not None:
+            raise self._load_error
+
+        try:
+            inmates, total_pages_checked, failed_pages = self._fetch_all_pages()
+        except Exception as e:
+            self._load_error = e
+            raise
+
+        logger.info(f"Loaded {self._count_inmates(inmates)} inmates (checked up to page {total_pages_checked})")
+        self._current_inmates = inmates
+        if failed_pages:
+            # A partial list would report the missing pages' inmates as not in custody on later runs
+            logger.warning(f"Not caching confinements: {failed_pages} pages failed to load")
+        elif self.use_cache:
+            self._save_cached_inmates(inmates)
+        return inmates
+
+    def _fetch_all_pages(self) -> Tuple[InmateIndex, int, int]:
+        """
+        Download and parse every page of current confinements.
+
+        Raises instead of returning an empty index: an empty list would report
+        every defendant as not in custody.
+
+        Returns:
+            Tuple of (inmate records indexed by name key, pages checked,
+            pages that failed to load)
+
+        Raises:
+            RuntimeError: If page 1 fails or no inmates are found on any page
+        """
         # Ensure session is initialized first
         self._ensure_session_initialized()
 
         logger.info("Fetching current confinements from jail (parallel)...")
-        inmates = {}
+        inmates, page_count = self._fetch_single_page(1)
+
+        if not inmates:
+            page_count = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as downloader, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as parser:
+            next_page = 2
+            failed_pages = 0
+            if page_count is not None:
+                pages_with_data, empty_pages, failed_pages = self._fetch_pages(
+                    downloader, parser, range(2, page_count.pages + 1), inmates
+                )
+                logger.info(
+                    f"Page count from first page: {page_count.pages} "
+                    f"({pages_with_data + 1} with data, {empty_pages} empty, {failed_pages} failed)"
+                )
+                next_page = page_count.pages + 1
+
+            if page_count is None or not page_count.exact:
+                # No result total: pagination links may show only a window of
+                # pages, so keep fetching batches until one comes back empty
+                batch_size = 20
+                batch_num = 0
+                while next_page <= MAX_PAGES:
+                    batch = range(next_page, min(next_page + batch_size, MAX_PAGES + 1))
+                    pages_with_data, empty_pages, batch_failed = self._fetch_pages(downloader, parser, batch, inmates)
+                    failed_pages += batch_failed
+                    batch_num += 1
+                    logger.info(
+                        f"Batch {batch_num}: {pages_with_data} pages with data, "
+                        f"{empty_pages} empty, {batch_failed} failed"
+                    )
+                    next_page = batch.stop
 
-        # Fetch pages in batches using ThreadPoolExecutor
-        # Use max_workers=3 to respect rate limiting while still parallelizing
-        batch_size = 20
-        current_batch_start = 1
-        max_batches = 3  # Most jails have < 60 pages (3 batches)
-
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            for batch_num in range(max_batches):
-                # Submit all pages in current batch
-                future_to_page = {}
-                for page_idx in range(current_batch_start, current_batch_start + batch_size):
-                    future = executor.submit(self._fetch_single_page, page_idx)
-                    future_to_page[future] = page_idx
-
-                # Collect results as they complete
-                empty_pages = 0
-                pages_with_data = 0
-
-                for future in as_completed(future_to_page):
-                    page_idx = future_to_page[future]
-                    try:
-                        page_inmates = future.result()
-                        if page_inmates:
-                            inmates.update(page_inmates)
-                            pages_with_data += 1
-                        else:
-                            empty_pages += 1
-                    except Exception as e:
-                        logger.error(f"Error fetching page {page_idx}: {str(e)}")
-                        empty_pages += 1
-
-                logger.info(f"Batch {batch_num + 1}: {pages_with_data} pages with data, {empty_pages} empty")
-
-                # If all pages in batch were empty, stop fetching
-                if empty_pages == batch_size:
-                    logger.info("All pages in batch were empty, stopping pagination")
-                    break
-
-                # If last page had data, continue to next batch
-                current_batch_start += batch_size
-
-        total_pages_checked = current_batch_start - 1
-        logger.info(f"Loaded {len(inmates)} inmate name variations (checked up to page {total_pages_checked})")
-        self._current_inmates = inmates
-        return inmates
+                    # If all pages in batch were empty, stop fetching
+                    if empty_pages == len(batch):
+                        logger.info("All pages in batch were empty, stopping pagination")
+                        break
+
+        total_pages_checked = next_page - 1
+
+        if not inmates:
+            raise RuntimeError(f"No inmates found in current confinements (checked up to page {total_pages_checked})")
+
+        return inmates, total_pages_checked, failed_pages
+
+    def load_current_confinements(self) -> int:
+        """
+        Load the current confinements index ahead of custody checks.
+
+        Once loaded, check_custody is a pure in-memory lookup and safe to call
+        from several threads.
+
+        Returns:
+            Number of inmates currently in custody
+        """
+        return self._count_inmates(self._fetch_current_confinements())
+
+    @classmethod
+    def _load_cached_inmates(cls) -> Optional[InmateIndex]:
+        """
+        Load confinements saved by a recent run, if still fresh.
+
+        Returns:
+            Cached inmate index, or None if missing, stale, or unreadable
+        """
+        try:
+            age = time.time() - CACHE_PATH.stat().st_mtime
+            if age >= CACHE_TTL_SECONDS:
+                return None
+            with CACHE_PATH.open('r', encoding='utf-8') as f:
+                records = json.load(f)
+            inmates = {}
+            for record in records:
+                inmates.setdefault(name_key(record['last_name'], record['first_name']), []).append(record)
+            logger.info(f"Loaded {cls._count_inmates(inmates)} inmates from cache ({age:.0f}s old)")
+            return inmates
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable confinements cache: {str(e)}")
+            return None
+
+    @staticmethod
+    def _save_cached_inmates(inmates: InmateIndex):
+        """
+        Save confinements to disk for reuse by later runs.
+
+        The index is stored as a flat JSON list of inmate records, readable
+        and writable only by the current user.
+
+        Args:
+            inmates: Inmate index to cache
+        """
+        records = [record for entries in inmates.values() for record in entries]
+        try:
+            CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+            temp_path = CACHE_PATH.with_suffix('.tmp')
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(records, f)
+            temp_path.replace(CACHE_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to write confinements cache: {str(e)}")
+
+    def _fetch_pages(
+        self,
+        downloader: ThreadPoolExecutor,
+        parser: ThreadPoolExecutor,
+        pages: range,
+        inmates: InmateIndex
+    ) -> Tuple[int, int, int]:
+        """
+        Fetch pages concurrently and merge their inmates into the given index.
+
+        Downloads and parsing run as a two-stage pipeline: each page is handed
+        to the parse pool as soon as its download completes, so parsing overlaps
+        with the remaining network requests.
+
+        Args:
+            downloader: Executor for page downloads (network-bound)
+            parser: Executor for HTML parsing (CPU-bound, lxml releases the GIL)
+            pages: Page numbers to fetch
+            inmates: Index updated in place with each page's inmates
+
+        Returns:
+            Tuple of (pages with data, empty pages, pages that failed to download or parse)
+        """
+        download_to_page = {
+            downloader.submit(self._download_page, page_idx): page_idx
+            for page_idx in pages
+        }
+
+        empty_pages = 0
+        failed_pages = 0
+        pages_with_data = 0
+
+        parse_to_page = {}
+        for future in as_completed(download_to_page):
+            page_idx = download_to_page[future]
+            try:
+                html_bytes = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching page {page_idx}: {str(e)}")
+                failed_pages += 1
+                continue
+            parse_to_page[parser.submit(self._parse_page, page_idx, html_bytes)] = page_idx
+
+        # Collect parsed pages as they complete
+        for future in as_completed(parse_to_page):
+            page_idx = parse_to_page[future]
+            try:
+                page_inmates, _ = future.result()
+                if page_inmates:
+                    for key, records in page_inmates.items():
+                        inmates.setdefault(key, []).extend(records)
+                    pages_with_data += 1
+                else:
+                    empty_pages += 1
+            except Exception as e:
+                logger.error(f"Error parsing page {page_idx}: {str(e)}")
+                failed_pages += 1
+
+        return pages_with_data, empty_pages, failed_pages
 
     @staticmethod
-    def _normalize_name(last: str, first: str, middle: str = '') -> str:
+    def _extract_page_count(document, cards_on_page: int) -> Optional[PageCount]:
         """
-        Normalize name for matching (lowercase, no extra spaces).
+        Read the total number of result pages from a confinements page.
+
+        Prefers the result total in the page header (an exact count), falling
+        back to the highest page number shown by the pagination links (not
+        exact: a windowed widget such as "1 2 3 4 5 ... Next" shows only some
+        pages). Only link text and data-page attributes that are plain numbers
+        count, so digits inside hrefs or scripts (such as the agency ID) are
+        never read as a page number. The result is capped at MAX_PAGES.
+
+        >>> from lxml import html
+        >>> doc = html.fromstring('<div><h5 class="text-muted">Current Confinements: '
+        ...                       '<span class="text-primary">42</span></h5></div>')
+        >>> JailAPIClient._extract_page_count(doc, 20)
+        PageCount(pages=3, exact=True)
+        >>> doc = html.fromstring('<ul class="pagination"><li><a class="page-link">1</a></li>'
+        ...                       '<li><a class="page-link" data-page="7" href="?id=SC018013C">Last</a></li></ul>')
+        >>> JailAPIClient._extract_page_count(doc, 20)
+        PageCount(pages=7, exact=False)
+        >>> doc = html.fromstring('<ul class="pagination"><li><a>1</a></li><li><a>5000</a></li></ul>')
+        >>> JailAPIClient._extract_page_count(doc, 20).pages == MAX_PAGES
+        True
+        >>> JailAPIClient._extract_page_count(html.fromstring('<div></div>'), 20) is None
+        True
+
+        Args:
+            document: Parsed lxml document of a confinements page
+            cards_on_page: Number of booking cards on that (full) page
 
-        >>> JailAPIClient._normalize_name("Smith", "John", "Q")
-        'smith john q'
-        >>> JailAPIClient._normalize_name("ADAMS", "AVERY", "ARRON")
-        'adams avery arron'
+        Returns:
+            Page count, or None if the page carries no pagination hint
         """
-        parts = [last, first]
-        if middle:
-            parts.append(middle)
-        return ' '.join(p.lower().strip() for p in parts if p)
+        total = _XP_RESULT_TOTAL(document).strip().replace(',', '')
+        if total.isdigit() and cards_on_page:
+            return PageCount(min(MAX_PAGES, max(1, -(-int(total) // cards_on_page))), exact=True)
+
+        page_numbers = [
+            int(text)
+            for link in _XP_PAGE_LINKS(document)
+            for text in (link.text_content().strip(), link.get('data-page', '').strip())
+            if text.isdigit()
+        ]
+        return PageCount(min(MAX_PAGES, max(page_numbers)), exact=False) if page_numbers else None
+
+    @staticmethod
+    def _middle_name_score(wanted: str, candidate: str) -> int:
+        """
+        Score how well an inmate's middle name matches the defendant's.
+
+        Full match beats initial match, which beats a missing middle name
+        on either side; conflicting middle names score lowest.
+
+        >>> JailAPIClient._middle_name_score("Quincy", "QUINCY")
+        3
+        >>> JailAPIClient._middle_name_score("Q.", "QUINCY")
+        2
+        >>> JailAPIClient._middle_name_score("", "QUINCY")
+        1
+        >>> JailAPIClient._middle_name_score("Ann", "MARIE")
+        0
+        """
+        wanted = wanted.lower().strip().rstrip('.')
+        candidate = candidate.lower().strip().rstrip('.')
+        if not wanted or not candidate:
+            return 1
+        if wanted == candidate:
+            return 3
+        if wanted[0] == candidate[0] and (len(wanted) == 1 or len(candidate) == 1):
+            return 2
+        return 0
+
+    @staticmethod
+    def _count_inmates(inmates: InmateIndex) -> int:
+        """Count inmate records across all index entries."""
+        return sum(len(records) for records in inmates.values())
 
     def check_custody(self, defendant: Defendant) -> CustodyResult:
         """
@@ -380,29 +667,24 @@ class JailAPIClient:
             # Fetch current confinements (uses cache after first call)
             inmates = self._fetch_current_confinements()
 
-            # Try to find match with multiple name variations
-            lookup_keys = [
-                self._normalize_name(last_name, first_name, middle_name),
-                self._normalize_name(last_name, first_name, ''),  # Without middle name
-            ]
-
-            for key in lookup_keys:
-                if key in inmates:
-                    inmate = inmates[key]
-                    logger.info(f"IN CUSTODY: {defendant.full_name} matched as {inmate['full_name']}")
-                    return CustodyResult(
-                        defendant_name=defendant.full_name,
-                        matter_number=defendant.matter_number,
-                        case_number=defendant.case_number,
-                        in_custody=True,
-                        booking_number=inmate.get('booking_number'),
-                        booking_date=inmate.get('booking_date'),
-                        custody_location='Dorchester County Detention Center',
-                        charges_at_booking=inmate.get('charges'),
-                        bond_amount=inmate.get('bond_amount'),
-                        mugshot_url=inmate.get('mugshot_url'),
-                        status_summary=f"IN CUSTODY - Matched as {inmate['full_name']}"
-                    )
+            # Same last/first name; prefer the inmate whose middle name agrees best
+            candidates = inmates.get(defendant.lookup_key)
+            if candidates:
+                inmate = max(candidates, key=lambda c: self._middle_name_score(middle_name, c['middle_name']))
+                logger.info(f"IN CUSTODY: {defendant.full_name} matched as {inmate['full_name']}")
+                return CustodyResult(
+                    defendant_name=defendant.full_name,
+                    matter_number=defendant.matter_number,
+                    case_number=defendant.case_number,
+                    in_custody=True,
+                    booking_number=inmate.get('booking_number'),
+                    booking_date=inmate.get('booking_date'),
+                    custody_location='Dorchester County Detention Center',
+                    charges_at_booking=inmate.get('charges'),
+                    bond_amount=inmate.get('bond_amount'),
+                    mugshot_url=inmate.get('mugshot_url'),
+                    status_summary=f"IN CUSTODY - Matched as {inmate['full_name']}"
+                )
 
             # Not found in current confinements
             logger.info(f"Not in custody: {defendant.full_name}")
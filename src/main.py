@@ -12,7 +12,7 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
-from models import CustodyReport
+from models import CustodyReport, batch_timestamp
 from parsers import parse_file
 from jail_api import JailAPIClient
 from reports import generate_json_report, generate_excel_report
@@ -29,22 +29,30 @@ def check_custody_for_all(defendants, api_client: JailAPIClient) -> list:
     """
     Check custody status for all defendants.
 
+    Confinements are loaded once up front; the per-defendant checks are then
+    in-memory lookups.
+
     Args:
         defendants: List of Defendant objects
         api_client: JailAPIClient instance
 
     Returns:
-        List of CustodyResult objects
+        List of CustodyResult objects (same order as defendants)
     """
-    results = []
-
     logger.info(f"Checking custody for {len(defendants)} defendants...")
 
-    for i, defendant in enumerate(defendants, 1):
-        logger.info(f"[{i}/{len(defendants)}] Checking: {defendant.full_name}")
+    try:
+        api_client.load_current_confinements()
+    except Exception as e:
+        # Leave error reporting to check_custody, one defendant at a time
+        logger.error(f"Failed to load current confinements: {e}")
 
-        result = api_client.check_custody(defendant)
-        results.append(result)
+    # Every result in this run shares one query timestamp
+    with batch_timestamp():
+        results = [api_client.check_custody(defendant) for defendant in defendants]
+
+    for i, (defendant, result) in enumerate(zip(defendants, results), 1):
+        logger.info(f"[{i}/{len(defendants)}] Checked: {defendant.full_name}")
 
         if result.in_custody:
             logger.warning(f"  *** IN CUSTODY: {defendant.full_name} ***")
@@ -88,6 +96,14 @@ def main():
         help='Delay in seconds between API requests (default: 1.5)'
     )
 
+    parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=3,
+        help='Number of concurrent page fetches (default: 3)'
+    )
+
     parser.add_argument(
         '--timeout',
         '-t',
@@ -104,6 +120,12 @@ def main():
         help='Maximum number of retry attempts (default: 3)'
     )
 
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always fetch fresh confinements instead of reusing a recent run\'s results'
+    )
+
     parser.add_argument(
         '--verbose',
         '-v',
@@ -141,7 +163,9 @@ def main():
         with JailAPIClient(
             delay_seconds=args.delay,
             max_retries=args.max_retries,
-            timeout=args.timeout
+            timeout=args.timeout,
+            max_workers=args.workers,
+            use_cache=not args.no_cache
         ) as api_client:
 
             # Check custody for all defendants
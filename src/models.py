@@ -4,9 +4,66 @@ Pydantic v2 models for jail custody checker.
 This module defines the data models for defendants, custody results, and reports.
 """
 
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from enum import IntEnum
+from functools import cached_property, lru_cache
+from typing import Iterator, Optional, List, NamedTuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+# Shared timestamp for results created inside a batch_timestamp() block
+_batch_time: ContextVar[Optional[datetime]] = ContextVar('batch_time', default=None)
+
+
+def _now() -> datetime:
+    """Returns the current batch timestamp, or the current time outside a batch."""
+    return _batch_time.get() or datetime.now()
+
+
+@contextmanager
+def batch_timestamp(timestamp: Optional[datetime] = None) -> Iterator[datetime]:
+    """
+    Give every model created in this block the same timestamp, instead of
+    reading the clock once per result.
+
+    Context variables don't follow work handed to a thread pool, so enter
+    the block inside each worker call.
+
+    >>> with batch_timestamp(datetime(2025, 1, 2)):
+    ...     CustodyResult(defendant_name="A, B", in_custody=False).query_timestamp
+    datetime.datetime(2025, 1, 2, 0, 0)
+
+    Args:
+        timestamp: Time to use (default: now)
+
+    Yields:
+        The batch timestamp
+    """
+    timestamp = timestamp or datetime.now()
+    token = _batch_time.set(timestamp)
+    try:
+        yield timestamp
+    finally:
+        _batch_time.reset(token)
+
+
+@lru_cache(maxsize=4096)
+def name_key(last: str, first: str) -> tuple[str, str]:
+    """
+    Returns the (last, first) key that defendants and jail inmates are
+    matched on: lowercase, without surrounding spaces.
+
+    Memoized: the same names recur across defendants and repeated checks.
+
+    >>> name_key("Smith", "John")
+    ('smith', 'john')
+    >>> name_key(" ADAMS", "AVERY ")
+    ('adams', 'avery')
+    """
+    return (last.lower().strip(), first.lower().strip())
 
 
 class Defendant(BaseModel):
@@ -20,6 +77,9 @@ class Defendant(BaseModel):
     ('John', '', 'Smith')
     """
 
+    # Defendants are read-only once parsed, which keeps lookup_key valid
+    model_config = ConfigDict(frozen=True)
+
     last_name: str = Field(..., description="Defendant's last name")
     first_name: str = Field(..., description="Defendant's first name")
     middle_name: Optional[str] = Field(default="", description="Defendant's middle name or initial")
@@ -29,10 +89,11 @@ class Defendant(BaseModel):
     incident_date: Optional[str] = Field(default=None, description="Incident date")
     case_status: Optional[str] = Field(default=None, description="Current case status")
 
-    @property
+    @cached_property
     def full_name(self) -> str:
         """
-        Returns formatted full name (Last, First Middle).
+        Returns formatted full name (Last, First Middle). Computed once per
+        defendant, since it is read for every log line and result.
 
         >>> d = Defendant(last_name="Johnson", first_name="Jane", middle_name="Marie")
         >>> d.full_name
@@ -52,6 +113,18 @@ class Defendant(BaseModel):
         """
         return (self.first_name, self.middle_name or "", self.last_name)
 
+    @cached_property
+    def lookup_key(self) -> tuple[str, str]:
+        """
+        Returns the (last, first) key used to look up this defendant in the
+        jail's inmate index. Computed once per defendant.
+
+        >>> d = Defendant(last_name="Smith", first_name="JOHN")
+        >>> d.lookup_key
+        ('smith', 'john')
+        """
+        return name_key(self.last_name, self.first_name)
+
     @field_validator('last_name', 'first_name')
     @classmethod
     def validate_name_not_empty(cls, v: str) -> str:
@@ -68,6 +141,19 @@ class Defendant(BaseModel):
         return v.strip()
 
 
+class Status(IntEnum):
+    """
+    Outcome of a custody check.
+
+    >>> Status.IN_CUSTODY.name
+    'IN_CUSTODY'
+    """
+
+    NOT_IN_CUSTODY = 0
+    IN_CUSTODY = 1
+    ERROR = 2
+
+
 class CustodyResult(BaseModel):
     """
     Represents the custody status result from jail database query.
@@ -77,6 +163,9 @@ class CustodyResult(BaseModel):
     True
     """
 
+    # Results are not changed after the query, which lets status_summary be cached
+    model_config = ConfigDict(frozen=True)
+
     defendant_name: str = Field(..., description="Full name of defendant")
     matter_number: Optional[str] = Field(default=None, description="Matter number from prosecutor list")
     case_number: Optional[str] = Field(default=None, description="Case number from prosecutor list")
@@ -87,13 +176,29 @@ class CustodyResult(BaseModel):
     charges_at_booking: Optional[str] = Field(default=None, description="Charges at time of booking")
     bond_amount: Optional[str] = Field(default=None, description="Bond amount if set")
     mugshot_url: Optional[str] = Field(default=None, description="URL to mugshot image")
-    query_timestamp: datetime = Field(default_factory=datetime.now, description="When this query was performed")
+    query_timestamp: datetime = Field(default_factory=_now, description="When this query was performed")
     error_message: Optional[str] = Field(default=None, description="Error message if query failed")
 
     @property
+    def status(self) -> Status:
+        """
+        Returns the outcome of the check; a failed query is an error
+        whatever the in_custody flag says.
+
+        >>> CustodyResult(defendant_name="Doe, Jane", in_custody=True).status
+        <Status.IN_CUSTODY: 1>
+        >>> CustodyResult(defendant_name="Doe, Jane", in_custody=False, error_message="Timeout").status
+        <Status.ERROR: 2>
+        """
+        if self.error_message:
+            return Status.ERROR
+        return Status.IN_CUSTODY if self.in_custody else Status.NOT_IN_CUSTODY
+
+    @cached_property
     def status_summary(self) -> str:
         """
-        Returns a human-readable summary of custody status.
+        Returns a human-readable summary of custody status. Computed once,
+        since results are frozen.
 
         >>> result = CustodyResult(defendant_name="Doe, Jane", in_custody=True, booking_date="10/27/2025")
         >>> result.status_summary
@@ -104,11 +209,33 @@ class CustodyResult(BaseModel):
         """
         if self.error_message:
             return f"ERROR: {self.error_message}"
-        if self.in_custody:
-            if self.booking_date:
-                return f"IN CUSTODY - Booked: {self.booking_date}"
-            return "IN CUSTODY"
-        return "NOT IN CUSTODY"
+        if not self.in_custody:
+            return "NOT IN CUSTODY"
+        booking_date = self.booking_date
+        return f"IN CUSTODY - Booked: {booking_date}" if booking_date else "IN CUSTODY"
+
+
+# Layout of CustodyReport.summary()
+_SUMMARY_TEMPLATE = (
+    "Custody Check Summary\n"
+    + "=" * 50 + "\n"
+    "Date: {date}\n"
+    "Source: {source}\n"
+    "\n"
+    "Total Defendants Checked: {total}\n"
+    "In Custody: {in_custody}\n"
+    "Not in Custody: {not_in_custody}\n"
+    "Errors: {errors}\n"
+)
+
+
+class _ReportStats(NamedTuple):
+    """Custody result counts, gathered in a single pass."""
+
+    in_custody: int
+    not_in_custody: int
+    errors: int
+    in_custody_list: List["CustodyResult"]
 
 
 class CustodyReport(BaseModel):
@@ -124,7 +251,11 @@ class CustodyReport(BaseModel):
     1
     """
 
-    search_date: datetime = Field(default_factory=datetime.now, description="Date/time report was generated")
+    # Reports are built once and then only read; freezing them is what makes
+    # caching the result counts below safe.
+    model_config = ConfigDict(frozen=True)
+
+    search_date: datetime = Field(default_factory=_now, description="Date/time report was generated")
     source_file: Optional[str] = Field(default=None, description="Path to input file (CSV or PDF)")
     defendants_checked: List[Defendant] = Field(default_factory=list, description="List of defendants checked")
     custody_results: List[CustodyResult] = Field(default_factory=list, description="Custody status results")
@@ -140,6 +271,28 @@ class CustodyReport(BaseModel):
         """
         return len(self.defendants_checked)
 
+    @cached_property
+    def _stats(self) -> _ReportStats:
+        """
+        Count custody results by status; cached since the report is frozen.
+        Failed checks count as errors and as not in custody.
+
+        >>> results = [
+        ...     CustodyResult(defendant_name="A, B", in_custody=True),
+        ...     CustodyResult(defendant_name="C, D", in_custody=False, error_message="Timeout")
+        ... ]
+        >>> stats = CustodyReport(custody_results=results)._stats
+        >>> stats.in_custody, stats.not_in_custody, stats.errors
+        (1, 1, 1)
+        """
+        counts = Counter(r.status for r in self.custody_results)
+        return _ReportStats(
+            in_custody=counts[Status.IN_CUSTODY],
+            not_in_custody=counts[Status.NOT_IN_CUSTODY] + counts[Status.ERROR],
+            errors=counts[Status.ERROR],
+            in_custody_list=[r for r in self.custody_results if r.status is Status.IN_CUSTODY],
+        )
+
     @property
     def in_custody_count(self) -> int:
         """
@@ -153,7 +306,7 @@ class CustodyReport(BaseModel):
         >>> report.in_custody_count
         1
         """
-        return sum(1 for r in self.custody_results if r.in_custody)
+        return self._stats.in_custody
 
     @property
     def not_in_custody_count(self) -> int:
@@ -169,7 +322,7 @@ class CustodyReport(BaseModel):
         >>> report.not_in_custody_count
         2
         """
-        return sum(1 for r in self.custody_results if not r.in_custody)
+        return self._stats.not_in_custody
 
     @property
     def error_count(self) -> int:
@@ -184,7 +337,7 @@ class CustodyReport(BaseModel):
         >>> report.error_count
         1
         """
-        return sum(1 for r in self.custody_results if r.error_message)
+        return self._stats.errors
 
     def get_in_custody_list(self) -> List[CustodyResult]:
         """
@@ -200,7 +353,7 @@ class CustodyReport(BaseModel):
         >>> report.get_in_custody_list()[0].defendant_name
         'Smith, John'
         """
-        return [r for r in self.custody_results if r.in_custody]
+        return list(self._stats.in_custody_list)
 
     def summary(self) -> str:
         """
@@ -211,18 +364,17 @@ class CustodyReport(BaseModel):
         ...     CustodyResult(defendant_name="C, D", in_custody=False)
         ... ]
         >>> report = CustodyReport(custody_results=results)
-        >>> "Total: 2" in report.summary()
+        >>> "Total Defendants Checked: 0" in report.summary()
         True
         >>> "In Custody: 1" in report.summary()
         True
         """
-        return f"""Custody Check Summary
-{'=' * 50}
-Date: {self.search_date.strftime('%Y-%m-%d %H:%M:%S')}
-Source: {self.source_file or 'N/A'}
-
-Total Defendants Checked: {self.total_defendants}
-In Custody: {self.in_custody_count}
-Not in Custody: {self.not_in_custody_count}
-Errors: {self.error_count}
-"""
+        stats = self._stats
+        return _SUMMARY_TEMPLATE.format(
+            date=self.search_date.strftime('%Y-%m-%d %H:%M:%S'),
+            source=self.source_file or 'N/A',
+            total=self.total_defendants,
+            in_custody=stats.in_custody,
+            not_in_custody=stats.not_in_custody,
+            errors=stats.errors,
+        )
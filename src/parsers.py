@@ -6,24 +6,47 @@ This module provides functions to extract defendant information from:
 - PDF files (Prosecutor Worklist Report)
 """
 
+import os
 import re
 import csv
+import json
+import math
+import time
+import hashlib
 import logging
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
-import pdfplumber
-import pandas as pd
+from typing import List, Optional, Tuple
 
 from models import Defendant
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Word positions extracted from PDFs, reused when the same file is parsed again.
+# Kept per user and owner-only; entries unused for PDF_CACHE_MAX_AGE_SECONDS are removed
+PDF_CACHE_DIR = Path.home() / ".cache" / "jail-checker" / "pdf_words"
+PDF_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
 
+# PDFs with at least this many pages are extracted across worker processes;
+# below it, process start-up costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 8
+
+# (text, x0, top) for each word on a PDF page
+PageWords = List[Tuple[str, float, float]]
+
+
+@lru_cache(maxsize=4096)
 def parse_defendant_name(name_str: str) -> tuple[str, str, str]:
     """
     Parse a defendant name string into first, middle, and last names.
 
+    Results are memoized, since the same names recur across a report and
+    between runs of the same docket.
+
     Handles formats like:
     - "Last, First Middle"
     - "Last, First M."
@@ -37,49 +60,44 @@ def parse_defendant_name(name_str: str) -> tuple[str, str, str]:
     >>> parse_defendant_name("Johnson, Bob")
     ('Bob', '', 'Johnson')
     """
-    name_str = name_str.strip()
-
     # Handle "Last, First Middle" format
-    if ',' in name_str:
-        parts = name_str.split(',', 1)
-        last_name = parts[0].strip()
-        first_middle = parts[1].strip()
-
-        # Split first and middle
+    last_name, sep, first_middle = name_str.partition(',')
+    if sep:
+        last_name = last_name.strip()
         name_parts = first_middle.split()
-        if len(name_parts) >= 2:
-            first_name = name_parts[0]
-            middle_name = ' '.join(name_parts[1:])
-        elif len(name_parts) == 1:
-            first_name = name_parts[0]
-            middle_name = ""
-        else:
-            first_name = ""
-            middle_name = ""
-
-        return (first_name, middle_name, last_name)
-
-    # Handle "First Last" or "First Middle Last" format
-    parts = name_str.split()
-    if len(parts) >= 3:
-        first_name = parts[0]
-        middle_name = ' '.join(parts[1:-1])
-        last_name = parts[-1]
-    elif len(parts) == 2:
-        first_name = parts[0]
-        middle_name = ""
-        last_name = parts[1]
-    elif len(parts) == 1:
-        # Only one name, assume it's the last name
-        first_name = ""
-        middle_name = ""
-        last_name = parts[0]
     else:
-        first_name = ""
-        middle_name = ""
-        last_name = ""
-
-    return (first_name, middle_name, last_name)
+        # Handle "First Last" or "First Middle Last" format
+        name_parts = name_str.split()
+        if not name_parts:
+            return ("", "", "")
+        # A lone name is assumed to be the last name
+        last_name = name_parts.pop()
+
+    if not name_parts:
+        return ("", "", last_name)
+    if len(name_parts) == 1:
+        return (name_parts[0], "", last_name)
+    if len(name_parts) == 2:
+        return (name_parts[0], name_parts[1], last_name)
+    return (name_parts[0], ' '.join(name_parts[1:]), last_name)
+
+
+def _cell(row: List[str], index: Optional[int]) -> Optional[str]:
+    """
+    Return a CSV cell stripped of whitespace, or None if it is empty or the
+    column is missing (index is None).
+
+    >>> _cell(['2024GS001', ' Theft '], 1)
+    'Theft'
+    >>> _cell(['2024GS001', ''], 1) is None
+    True
+    >>> _cell(['2024GS001'], None) is None
+    True
+    """
+    if index is None:
+        return None
+    value = row[index]
+    return value.strip() if value else None
 
 
 def parse_csv_file(file_path: str | Path) -> List[Defendant]:
@@ -92,9 +110,10 @@ def parse_csv_file(file_path: str | Path) -> List[Defendant]:
     >>> import tempfile
     >>> import os
     >>> with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='') as f:
-    ...     f.write('CaseNumbers,Title,Defendants,InitiatedOn,Type\\n')
-    ...     f.write('2024GS001,Theft,Smith John Michael,01/15/2024,General Sessions\\n')
-    ...     f.write('2024GS002,Assault,Doe Jane,02/20/2024,General Sessions\\n')
+    ...     _ = f.write('Textbox1\\nActive Cases By Assigned Personnel Detail\\n\\n')
+    ...     _ = f.write('CaseNumbers,Title,Defendants,InitiatedOn,Type\\n')
+    ...     _ = f.write('2024GS001,Theft,"Smith, John Michael",01/15/2024,General Sessions\\n')
+    ...     _ = f.write('2024GS002,Assault,"Doe, Jane",02/20/2024,General Sessions\\n')
     ...     temp_path = f.name
     >>> defendants = parse_csv_file(temp_path)
     >>> len(defendants)
@@ -120,49 +139,61 @@ def parse_csv_file(file_path: str | Path) -> List[Defendant]:
         raise FileNotFoundError(f"CSV file not found: {file_path}")
 
     try:
-        # Read CSV with pandas for better handling
-        # Skip first 3 rows (textbox headers, title row, empty row) to get to actual column headers
-        df = pd.read_csv(file_path, skiprows=3)
-
-        # Check for required columns
-        if 'Defendants' not in df.columns:
-            raise ValueError("CSV file must contain 'Defendants' column")
-
-        defendants = []
-
-        for index, row in df.iterrows():
-            # Skip header rows or empty rows
-            if pd.isna(row.get('Defendants')) or str(row.get('Defendants')).strip() == '':
-                continue
-
-            # Skip the summary/header row
-            defendant_name = str(row['Defendants']).strip()
-            if 'ACTIVE CASES' in defendant_name.upper() or defendant_name == 'Defendants':
-                continue
-
-            # Parse the name
-            first, middle, last = parse_defendant_name(defendant_name)
-
-            if not last:  # Skip if we couldn't parse a last name
-                continue
-
-            # Extract other fields
-            case_number = str(row.get('CaseNumbers', '')).strip() if pd.notna(row.get('CaseNumbers')) else None
-            charges = str(row.get('Title', '')).strip() if pd.notna(row.get('Title')) else None
-            incident_date = str(row.get('InitiatedOn', '')).strip() if pd.notna(row.get('InitiatedOn')) else None
-            case_status = str(row.get('CaseStatus', '')).strip() if pd.notna(row.get('CaseStatus')) else None
-
-            defendant = Defendant(
-                last_name=last,
-                first_name=first,
-                middle_name=middle,
-                case_number=case_number,
-                charges=charges,
-                incident_date=incident_date,
-                case_status=case_status
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+
+            # Skip first 3 rows (textbox headers, title row, empty row) to get to actual column headers
+            for _ in range(3):
+                next(reader, None)
+            header = next((row for row in reader if row), [])
+
+            # Check for required columns
+            if 'Defendants' not in header:
+                raise ValueError("CSV file must contain 'Defendants' column")
+
+            # Resolve column positions once; a repeated header name uses its
+            # last occurrence
+            columns = {name: i for i, name in enumerate(header)}
+            name_col = columns['Defendants']
+            case_col, title_col, date_col, status_col = (
+                columns.get(name) for name in ('CaseNumbers', 'Title', 'InitiatedOn', 'CaseStatus')
             )
-
-            defendants.append(defendant)
+            width = len(header)
+
+            defendants = []
+
+            # Rows are streamed; only the columns we use are looked at
+            for row in reader:
+                if len(row) < width:
+                    row += [''] * (width - len(row))
+
+                # Skip header rows or empty rows
+                defendant_name = row[name_col].strip()
+                if not defendant_name:
+                    continue
+
+                # Skip the summary/header row
+                if 'ACTIVE CASES' in defendant_name.upper() or defendant_name == 'Defendants':
+                    continue
+
+                # Parse the name
+                first, middle, last = parse_defendant_name(defendant_name)
+
+                if not last:  # Skip if we couldn't parse a last name
+                    continue
+                if not first:
+                    raise ValueError(f"Defendant name has no first name: {defendant_name!r}")
+
+                # Names are already stripped and non-empty, so skip re-validation
+                defendants.append(Defendant.model_construct(
+                    last_name=last,
+                    first_name=first,
+                    middle_name=middle,
+                    case_number=_cell(row, case_col),
+                    charges=_cell(row, title_col),
+                    incident_date=_cell(row, date_col),
+                    case_status=_cell(row, status_col)
+                ))
 
         return defendants
 
@@ -170,6 +201,123 @@ def parse_csv_file(file_path: str | Path) -> List[Defendant]:
         raise ValueError(f"Error parsing CSV file: {str(e)}")
 
 
+def _pdf_cache_path(file_path: Path) -> Path:
+    """
+    Return the word cache file for a PDF, keyed by its path, mtime and size
+    so an edited or replaced file is extracted again.
+
+    Args:
+        file_path: Path to the PDF file
+
+    Returns:
+        Path of the cache file (which may not exist yet)
+    """
+    stat = file_path.stat()
+    identity = f"{file_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    key = hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+    return PDF_CACHE_DIR / f"{key}.json"
+
+
+def _prune_pdf_cache(now: float):
+    """
+    Delete cached word files not used within PDF_CACHE_MAX_AGE_SECONDS.
+
+    Args:
+        now: Current time (seconds since the epoch)
+    """
+    for path in PDF_CACHE_DIR.glob('*.json'):
+        try:
+            if now - path.stat().st_mtime >= PDF_CACHE_MAX_AGE_SECONDS:
+                path.unlink()
+        except OSError:
+            continue
+
+
+def _extract_page_words(file_path: str, start: int, stop: int) -> List[PageWords]:
+    """
+    Extract the words of pages [start, stop) of a PDF.
+
+    Module-level so it can run in a worker process; each call opens the PDF
+    once for its whole page range.
+
+    Args:
+        file_path: Path to the PDF file
+        start: First page index (0-based)
+        stop: Page index to stop before
+
+    Returns:
+        One list of (text, x0, top) tuples per page
+    """
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        return [
+            [(w['text'], w['x0'], w['top']) for w in page.extract_words()]
+            for page in pdf.pages[start:stop]
+        ]
+
+
+def _extract_pdf_words(file_path: Path) -> List[PageWords]:
+    """
+    Extract the words of every page of a PDF, using the on-disk cache when
+    this exact file has been extracted before.
+
+    Args:
+        file_path: Path to the PDF file
+
+    Returns:
+        One list of (text, x0, top) tuples per page
+    """
+    cache_path = _pdf_cache_path(file_path)
+    try:
+        with cache_path.open('r', encoding='utf-8') as f:
+            pages = json.load(f)
+        # Mark the entry as recently used so pruning keeps it
+        os.utime(cache_path)
+        logger.info(f"Loaded PDF words from cache: {cache_path}")
+        return pages
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable PDF word cache: {str(e)}")
+
+    # pdfplumber/pdfminer are slow to import; only load them for PDF input
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+
+    workers = min(os.cpu_count() or 1, page_count // (PDF_PARALLEL_MIN_PAGES // 2))
+    if page_count < PDF_PARALLEL_MIN_PAGES or workers < 2:
+        pages = _extract_page_words(str(file_path), 0, page_count)
+    else:
+        # pdfminer layout analysis is pure Python, so split the pages into
+        # one contiguous range per worker process
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(
+                _extract_page_words,
+                [str(file_path)] * workers,
+                bounds[:-1],
+                bounds[1:]
+            )
+            pages = [page for chunk in chunks for page in chunk]
+        logger.info(f"Extracted {page_count} PDF pages using {workers} processes")
+
+    try:
+        PDF_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        _prune_pdf_cache(time.time())
+        temp_path = cache_path.with_suffix('.tmp')
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(pages, f)
+        temp_path.replace(cache_path)
+    except Exception as e:
+        logger.warning(f"Failed to write PDF word cache: {str(e)}")
+
+    return pages
+
+
 def parse_pdf_file(file_path: str | Path) -> List[Defendant]:
     """
     Parse a PDF file containing defendant information.
@@ -195,98 +343,114 @@ def parse_pdf_file(file_path: str | Path) -> List[Defendant]:
     if not file_path.exists():
         raise FileNotFoundError(f"PDF file not found: {file_path}")
 
-    defendants = []
+    # Defendants keyed by (last, first, case number); dicts keep insertion
+    # order, so this both deduplicates and preserves the report order
+    defendants = {}
     all_case_numbers = []  # Track all case numbers found
     failed_extractions = []  # Track failed extractions
+    duplicate_count = 0
 
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                # Extract words with their positions
-                words = page.extract_words()
-
-                if not words:
-                    continue  # Skip pages with no content
-
-                # Find case numbers by position and content
-                # Case numbers are at x-position 100-200 and contain "GS"
-                case_words = [
-                    w for w in words
-                    if 'GS' in w['text']
-                    and 100 < w['x0'] < 200
+        for page_num, words in enumerate(_extract_pdf_words(file_path), 1):
+            if not words:
+                continue  # Skip pages with no content
+
+            # Index words by row once per page. Each word also goes into
+            # the neighbouring buckets, so a single lookup finds every word
+            # within 1pt of a row (in original order).
+            rows = defaultdict(list)
+            for word in words:
+                bucket = math.floor(word[2])
+                rows[bucket - 1].append(word)
+                rows[bucket].append(word)
+                rows[bucket + 1].append(word)
+
+            # Find case numbers by position and content
+            # Case numbers are at x-position 100-200 and contain "GS"
+            case_words = [
+                (text, top) for text, x0, top in words
+                if 100 < x0 < 200
+                and 'GS' in text
+            ]
+
+            for case_text, case_top in case_words:
+                # Clean up case number (remove trailing comma if present)
+                case_no = case_text.rstrip(',')
+                all_case_numbers.append(case_no)
+
+                row_words = [
+                    (text, x0) for text, x0, top in rows[math.floor(case_top)]
+                    if abs(top - case_top) < 1
                 ]
 
-                for case in case_words:
-                    # Clean up case number (remove trailing comma if present)
-                    case_no = case['text'].rstrip(',')
-                    all_case_numbers.append(case_no)
-
-                    # Extract matter number from same row (left column)
-                    # Matter numbers are at x-position < 100 and contain a dash
-                    matter_words = [
-                        w for w in words
-                        if abs(w['top'] - case['top']) < 1
-                        and w['x0'] < 100
-                        and '-' in w['text']
-                        and len(w['text']) > 3
-                    ]
-                    matter_no = matter_words[0]['text'] if matter_words else None
-
-                    # Extract defendant name from same row
-                    # Defendant names are in the column at x-position 210-360
-                    # and at the same y-position (top) as the case number
-                    defendant_words = [
-                        w for w in words
-                        if abs(w['top'] - case['top']) < 1
-                        and 210 < w['x0'] < 360
-                    ]
-
-                    if not defendant_words:
-                        failed_extractions.append({
-                            'case_number': case_no,
-                            'page': page_num,
-                            'reason': 'No defendant name found in expected column'
-                        })
-                        continue
-
-                    # Sort words by x-position and join to form name
-                    defendant_words_sorted = sorted(defendant_words, key=lambda x: x['x0'])
-                    defendant_name = ' '.join([w['text'] for w in defendant_words_sorted])
-
-                    if not defendant_name or not defendant_name.strip():
-                        failed_extractions.append({
-                            'case_number': case_no,
-                            'page': page_num,
-                            'reason': 'Defendant name was empty after extraction'
-                        })
-                        continue
-
-                    # Parse name into first, middle, last
-                    first, middle, last = parse_defendant_name(defendant_name)
-
-                    # Only add if we got BOTH first and last name (required by Defendant model)
-                    if not (first and first.strip() and last and last.strip()):
-                        failed_extractions.append({
-                            'case_number': case_no,
-                            'page': page_num,
-                            'defendant_name': defendant_name,
-                            'reason': f'Name parsing failed - first={repr(first)}, last={repr(last)}'
-                        })
-                        continue
-
-                    defendant = Defendant(
-                        last_name=last,
-                        first_name=first,
-                        middle_name=middle or "",
-                        matter_number=matter_no,
-                        case_number=case_no
-                    )
-                    defendants.append(defendant)
+                # Extract matter number from same row (left column)
+                # Matter numbers are at x-position < 100 and contain a dash
+                matter_no = next(
+                    (text for text, x0 in row_words
+                     if x0 < 100 and '-' in text and len(text) > 3),
+                    None
+                )
+
+                # Extract defendant name from same row
+                # Defendant names are in the column at x-position 210-360
+                defendant_words = [
+                    (x0, text) for text, x0 in row_words
+                    if 210 < x0 < 360
+                ]
+
+                if not defendant_words:
+                    failed_extractions.append({
+                        'case_number': case_no,
+                        'page': page_num,
+                        'reason': 'No defendant name found in expected column'
+                    })
+                    continue
+
+                # Sort words by x-position and join to form name
+                defendant_words.sort(key=itemgetter(0))
+                defendant_name = ' '.join([text for x0, text in defendant_words])
+
+                if not defendant_name or not defendant_name.strip():
+                    failed_extractions.append({
+                        'case_number': case_no,
+                        'page': page_num,
+                        'reason': 'Defendant name was empty after extraction'
+                    })
+                    continue
+
+                # Parse name into first, middle, last
+                first, middle, last = parse_defendant_name(defendant_name)
+
+                # Only add if we got BOTH first and last name (required by Defendant model)
+                if not (first and first.strip() and last and last.strip()):
+                    failed_extractions.append({
+                        'case_number': case_no,
+                        'page': page_num,
+                        'defendant_name': defendant_name,
+                        'reason': f'Name parsing failed - first={repr(first)}, last={repr(last)}'
+                    })
+                    continue
+
+                # Skip duplicates (same defendant might appear on multiple pages)
+                key = (last.lower(), first.lower(), case_no)
+                if key in defendants:
+                    duplicate_count += 1
+                    continue
+
+                # Names were checked above, so skip re-validation
+                defendants[key] = Defendant.model_construct(
+                    last_name=last,
+                    first_name=first,
+                    middle_name=middle or "",
+                    matter_number=matter_no,
+                    case_number=case_no
+                )
 
         # Log extraction statistics
         logger.info(f"PDF Extraction Summary:")
         logger.info(f"  Total case numbers found: {len(all_case_numbers)}")
         logger.info(f"  Successfully extracted: {len(defendants)}")
+        logger.info(f"  Duplicates skipped: {duplicate_count}")
         logger.info(f"  Failed extractions: {len(failed_extractions)}")
 
         if failed_extractions:
@@ -294,16 +458,7 @@ def parse_pdf_file(file_path: str | Path) -> List[Defendant]:
             for fail in failed_extractions:
                 logger.warning(f"  Page {fail['page']} | {fail['case_number']} - {fail['reason']}")
 
-        # Remove duplicates (same defendant might appear on multiple pages)
-        seen = set()
-        unique_defendants = []
-        for d in defendants:
-            key = (d.last_name.lower(), d.first_name.lower(), d.case_number)
-            if key not in seen:
-                seen.add(key)
-                unique_defendants.append(d)
-
-        return unique_defendants
+        return list(defendants.values())
 
     except Exception as e:
         raise ValueError(f"Error parsing PDF file: {str(e)}")
@@ -316,8 +471,9 @@ def parse_file(file_path: str | Path) -> List[Defendant]:
     >>> import tempfile
     >>> import os
     >>> with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='') as f:
-    ...     f.write('CaseNumbers,Defendants\\n')
-    ...     f.write('2024GS001,Smith John\\n')
+    ...     _ = f.write('Textbox1\\nActive Cases By Assigned Personnel Detail\\n\\n')
+    ...     _ = f.write('CaseNumbers,Defendants\\n')
+    ...     _ = f.write('2024GS001,"Smith, John"\\n')
     ...     temp_path = f.name
     >>> defendants = parse_file(temp_path)
     >>> len(defendants)
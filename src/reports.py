@@ -4,25 +4,88 @@ Report generators for custody check results.
 This module provides functions to generate custody reports in JSON and Excel formats.
 """
 
+import os
 import json
+import time
+import hashlib
+import zipfile
+import threading
 from pathlib import Path
+from collections import Counter
 from datetime import datetime
 from typing import List, Optional, Dict, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
+from operator import attrgetter
 import logging
-import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
 from openpyxl.drawing.image import Image
+from PIL import Image as PILImage
 
 from models import CustodyReport, CustodyResult
 
+# orjson is optional; it writes the JSON report much faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Concurrent mugshot downloads (also the size of the shared connection pool)
+MUGSHOT_WORKERS = 10
+
+# Mugshots are displayed at 100x125 px; thumbnails keep 2x that for zoom/print
+MUGSHOT_SIZE = (100, 125)
+MUGSHOT_THUMBNAIL_SIZE = (200, 250)
+
+# Downloaded mugshots are kept here and reused by later reports. Kept per user
+# and owner-only, since cached images are embedded next to defendants' names;
+# entries unused for MUGSHOT_CACHE_MAX_AGE_SECONDS are removed
+MUGSHOT_CACHE_DIR = Path.home() / ".cache" / "jail-checker" / "mugshots"
+MUGSHOT_CACHE_TTL_SECONDS = 24 * 60 * 60
+MUGSHOT_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Mugshot URLs that returned 404/410 are not requested again for this long
+MUGSHOT_MISSING_TTL_SECONDS = 60 * 60
+
+# Guards the download outcome counters shared by mugshot worker threads
+_OUTCOMES_LOCK = threading.Lock()
+
+# Excel styles, built once and shared by every report
+_THIN_SIDE = Side(style='thin')
+_THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+_CENTER = Alignment(horizontal='center', vertical='center')
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+_CUSTODY_HEADER_FILL = PatternFill(start_color="C00000", end_color="C00000", fill_type="solid")  # Dark red
+_SUMMARY_TITLE_FONT = Font(bold=True, size=16)
+_LABEL_FONT = Font(bold=True)
+_CUSTODY_TITLE_FONT = Font(bold=True, size=14, color="FFFFFF")
+_CUSTODY_TITLE_FILL = PatternFill(start_color="8B0000", end_color="8B0000", fill_type="solid")
+_IN_CUSTODY_FILL = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")  # Light red
+_NOT_IN_CUSTODY_FILL = PatternFill(start_color="E6FFE6", end_color="E6FFE6", fill_type="solid")  # Light green
+_ERROR_FILL = PatternFill(start_color="FFF9E6", end_color="FFF9E6", fill_type="solid")  # Light yellow
+
+# Data rows use named styles (fill + thin border), registered on each workbook,
+# so each cell takes a single style assignment
+_IN_CUSTODY_STYLE = "In Custody Row"
+_NOT_IN_CUSTODY_STYLE = "Not In Custody Row"
+_ERROR_STYLE = "Error Row"
+_ROW_STYLE_FILLS = {
+    _IN_CUSTODY_STYLE: _IN_CUSTODY_FILL,
+    _NOT_IN_CUSTODY_STYLE: _NOT_IN_CUSTODY_FILL,
+    _ERROR_STYLE: _ERROR_FILL,
+}
+
 
 def generate_json_report(report: CustodyReport, output_path: str | Path) -> Path:
     """
@@ -51,68 +114,114 @@ def generate_json_report(report: CustodyReport, output_path: str | Path) -> Path
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Convert report to dictionary
-    report_dict = {
-        "search_date": report.search_date.isoformat(),
-        "source_file": report.source_file,
-        "summary": {
-            "total_defendants": report.total_defendants,
-            "in_custody": report.in_custody_count,
-            "not_in_custody": report.not_in_custody_count,
-            "errors": report.error_count
-        },
-        "defendants": [
-            {
-                "full_name": d.full_name,
-                "first_name": d.first_name,
-                "middle_name": d.middle_name,
-                "last_name": d.last_name,
-                "matter_number": d.matter_number,
-                "case_number": d.case_number,
-                "charges": d.charges,
-                "incident_date": d.incident_date,
-                "case_status": d.case_status
-            }
-            for d in report.defendants_checked
-        ],
-        "custody_results": [
-            {
-                "defendant_name": r.defendant_name,
-                "matter_number": r.matter_number,
-                "case_number": r.case_number,
-                "in_custody": r.in_custody,
-                "booking_number": r.booking_number,
-                "booking_date": r.booking_date,
-                "custody_location": r.custody_location,
-                "charges_at_booking": r.charges_at_booking,
-                "bond_amount": r.bond_amount,
-                "mugshot_url": r.mugshot_url,
-                "query_timestamp": r.query_timestamp.isoformat(),
-                "error_message": r.error_message,
-                "status_summary": r.status_summary
-            }
-            for r in report.custody_results
-        ],
-        "in_custody_list": [
-            {
-                "defendant_name": r.defendant_name,
-                "matter_number": r.matter_number,
-                "case_number": r.case_number,
-                "booking_date": r.booking_date,
-                "charges": r.charges_at_booking,
-                "bond_amount": r.bond_amount
-            }
-            for r in report.get_in_custody_list()
-        ]
+    summary = {
+        "total_defendants": report.total_defendants,
+        "in_custody": report.in_custody_count,
+        "not_in_custody": report.not_in_custody_count,
+        "errors": report.error_count
     }
 
-    # Write JSON file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report_dict, f, indent=2, ensure_ascii=False)
+    # Write JSON file one record at a time (same layout with either encoder)
+    with open(output_path, 'wb') as f:
+        f.write(b'{\n  "search_date": ' + _dumps_indented(report.search_date.isoformat()))
+        f.write(b',\n  "source_file": ' + _dumps_indented(report.source_file))
+        f.write(b',\n  "summary": ' + _dumps_indented(summary))
+        f.write(b',\n  "defendants": ')
+        _stream_array(f, report.defendants_checked, _defendant_dict)
+        f.write(b',\n  "custody_results": ')
+        _stream_array(f, report.custody_results, _custody_result_dict)
+        f.write(b',\n  "in_custody_list": ')
+        _stream_array(f, report.get_in_custody_list(), _in_custody_dict)
+        f.write(b'\n}')
 
     return output_path
 
 
+def _dumps_indented(value, indent: bytes = b'  ') -> bytes:
+    """
+    Encode a value as 2-space indented JSON, nested one level deeper by `indent`.
+
+    >>> _dumps_indented({"a": 1})
+    b'{\\n    "a": 1\\n  }'
+
+    Args:
+        value: JSON-serializable value
+        indent: Prefix added to every line after the first
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(value, indent=2, ensure_ascii=False).encode('utf-8')
+    # Newlines inside strings are escaped, so every raw newline starts a line
+    return encoded.replace(b'\n', b'\n' + indent)
+
+
+def _stream_array(f, iterable, to_dict) -> None:
+    """
+    Write a JSON array as a top-level report member without building the list.
+
+    Args:
+        f: Binary file object
+        iterable: Items to write
+        to_dict: Function converting an item to a JSON-serializable dict
+    """
+    first = True
+    for item in iterable:
+        f.write(b'[\n    ' if first else b',\n    ')
+        f.write(_dumps_indented(to_dict(item), b'    '))
+        first = False
+    f.write(b'[]' if first else b'\n  ]')
+
+
+def _defendant_dict(d) -> dict:
+    """Build the JSON record for a defendant."""
+    return {
+        "full_name": d.full_name,
+        "first_name": d.first_name,
+        "middle_name": d.middle_name,
+        "last_name": d.last_name,
+        "matter_number": d.matter_number,
+        "case_number": d.case_number,
+        "charges": d.charges,
+        "incident_date": d.incident_date,
+        "case_status": d.case_status
+    }
+
+
+def _custody_result_dict(r: CustodyResult) -> dict:
+    """Build the JSON record for a custody result."""
+    return {
+        "defendant_name": r.defendant_name,
+        "matter_number": r.matter_number,
+        "case_number": r.case_number,
+        "in_custody": r.in_custody,
+        "booking_number": r.booking_number,
+        "booking_date": r.booking_date,
+        "custody_location": r.custody_location,
+        "charges_at_booking": r.charges_at_booking,
+        "bond_amount": r.bond_amount,
+        "mugshot_url": r.mugshot_url,
+        "query_timestamp": r.query_timestamp.isoformat(),
+        "error_message": r.error_message,
+        "status_summary": r.status_summary
+    }
+
+
+def _in_custody_dict(r: CustodyResult) -> dict:
+    """Build the JSON record for the in-custody list."""
+    return {
+        "defendant_name": r.defendant_name,
+        "matter_number": r.matter_number,
+        "case_number": r.case_number,
+        "booking_date": r.booking_date,
+        "charges": r.charges_at_booking,
+        "bond_amount": r.bond_amount
+    }
+
+
 def generate_excel_report(report: CustodyReport, output_path: str | Path) -> Path:
     """
     Generate an Excel report of custody check results.
@@ -140,31 +249,237 @@ def generate_excel_report(report: CustodyReport, output_path: str | Path) -> Pat
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Create workbook
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
+    # Create workbook in write-only mode: rows are streamed to the file as they
+    # are appended instead of being held as a grid of cell objects
+    wb = Workbook(write_only=True)
+    for name, fill in _ROW_STYLE_FILLS.items():
+        wb.add_named_style(NamedStyle(name=name, font=DEFAULT_FONT, fill=fill, border=_THIN_BORDER))
+
+    # Download every mugshot once; both result sheets embed from this
+    mugshot_images = _download_mugshots_parallel(report.custody_results)
 
     # Create Summary sheet
     _create_summary_sheet(wb, report)
 
     # Create All Results sheet
-    _create_all_results_sheet(wb, report)
+    _create_all_results_sheet(wb, report, mugshot_images)
 
     # Create In Custody sheet
-    _create_in_custody_sheet(wb, report)
+    _create_in_custody_sheet(wb, report, mugshot_images)
 
     # Save workbook
     wb.save(output_path)
 
+    # Mugshots shown on both sheets are stored once
+    _deduplicate_media(output_path)
+
     return output_path
 
 
-def _download_mugshot(url: str) -> Optional[bytes]:
+def _deduplicate_media(xlsx_path: Path) -> int:
+    """
+    Store identical images in a saved workbook only once.
+
+    openpyxl writes a separate media part for every Image, so a mugshot shown on
+    both the All Results and In Custody sheets is stored twice. Duplicate parts
+    are dropped and their drawing relationships pointed at the first copy.
+
+    Args:
+        xlsx_path: Path of the saved workbook (rewritten in place)
+
+    Returns:
+        Number of duplicate images removed
+    """
+    with zipfile.ZipFile(xlsx_path) as archive:
+        entries = [(info, archive.read(info)) for info in archive.infolist()]
+
+    first_by_digest = {}
+    replacements = {}
+    for info, data in entries:
+        if info.filename.startswith('xl/media/'):
+            digest = hashlib.sha1(data).digest()
+            first = first_by_digest.setdefault(digest, info.filename)
+            if first != info.filename:
+                replacements[info.filename] = first
+
+    if not replacements:
+        return 0
+
+    tmp_path = xlsx_path.with_name(xlsx_path.name + '.tmp')
+    with zipfile.ZipFile(tmp_path, 'w') as archive:
+        for info, data in entries:
+            if info.filename in replacements:
+                continue
+            if info.filename.startswith('xl/drawings/_rels/'):
+                for duplicate, first in replacements.items():
+                    data = data.replace(f'Target="/{duplicate}"'.encode(), f'Target="/{first}"'.encode())
+            archive.writestr(info, data)
+    tmp_path.replace(xlsx_path)
+
+    logger.debug(f"Removed {len(replacements)} duplicate images from {xlsx_path.name}")
+    return len(replacements)
+
+
+def _create_mugshot_session() -> requests.Session:
+    """
+    Create a session for mugshot downloads.
+
+    Mugshots all come from the same host, so the download threads share one
+    keep-alive connection pool instead of opening a new connection per image.
+
+    Returns:
+        requests.Session with a pooled, retrying adapter
+    """
+    retry_strategy = Retry(
+        total=3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["GET"],
+        backoff_factor=0.2
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=2,
+        pool_maxsize=MUGSHOT_WORKERS
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _mugshot_cache_paths(url: str) -> Tuple[Path, Path]:
+    """
+    Return the cache files for a mugshot URL: the image bytes and its HTTP
+    validators (ETag / Last-Modified).
+
+    >>> image_path, validators_path = _mugshot_cache_paths("https://example.com/a.jpg")
+    >>> image_path.suffix, validators_path.suffix
+    ('.img', '.json')
+    """
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return MUGSHOT_CACHE_DIR / f"{key}.img", MUGSHOT_CACHE_DIR / f"{key}.json"
+
+
+def _write_private_file(path: Path, data: bytes) -> None:
+    """
+    Write a cache file readable and writable only by the current user,
+    creating the owner-only cache directory if needed.
+
+    Args:
+        path: File to write (replaced atomically)
+        data: File contents
+    """
+    MUGSHOT_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    temp_path.replace(path)
+
+
+def _prune_mugshot_cache(now: float) -> None:
+    """
+    Delete cached mugshots and validators not used within
+    MUGSHOT_CACHE_MAX_AGE_SECONDS, and not-found markers older than
+    MUGSHOT_MISSING_TTL_SECONDS.
+
+    Args:
+        now: Current time (seconds since the epoch)
+    """
+    for pattern, max_age in (
+        ('*.img', MUGSHOT_CACHE_MAX_AGE_SECONDS),
+        ('*.json', MUGSHOT_CACHE_MAX_AGE_SECONDS),
+        ('*.tmp', MUGSHOT_CACHE_MAX_AGE_SECONDS),
+        ('*.missing', MUGSHOT_MISSING_TTL_SECONDS),
+    ):
+        for path in MUGSHOT_CACHE_DIR.glob(pattern):
+            try:
+                if now - path.stat().st_mtime >= max_age:
+                    path.unlink()
+            except OSError:
+                continue
+
+
+def _save_cached_mugshot(url: str, response) -> None:
+    """
+    Save a downloaded mugshot and its validators for later reports.
+
+    Args:
+        url: URL the mugshot was downloaded from
+        response: Successful response for that URL
+    """
+    image_path, validators_path = _mugshot_cache_paths(url)
+    validators = {}
+    if response.headers.get('ETag'):
+        validators['If-None-Match'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        validators['If-Modified-Since'] = response.headers['Last-Modified']
+
+    try:
+        _write_private_file(image_path, response.content)
+        _write_private_file(validators_path, json.dumps(validators).encode('utf-8'))
+    except Exception as e:
+        logger.warning(f"Failed to cache mugshot {url}: {str(e)}")
+
+
+def _missing_mugshot_path(url: str) -> Path:
+    """
+    Return the marker file recording that a mugshot URL was not found.
+
+    Markers live in the owner-only mugshot cache and are deleted by
+    _prune_mugshot_cache once MUGSHOT_MISSING_TTL_SECONDS have passed.
+
+    >>> _missing_mugshot_path("https://example.com/a.jpg").suffix
+    '.missing'
+    """
+    return _mugshot_cache_paths(url)[0].with_suffix('.missing')
+
+
+def _is_known_missing_mugshot(url: str) -> bool:
+    """
+    Check whether a mugshot URL returned 404/410 within MUGSHOT_MISSING_TTL_SECONDS.
+
+    Args:
+        url: URL to mugshot image
+
+    Returns:
+        True if the URL should not be requested again yet
+    """
+    try:
+        return time.time() - _missing_mugshot_path(url).stat().st_mtime < MUGSHOT_MISSING_TTL_SECONDS
+    except OSError:
+        return False
+
+
+def _record_outcome(outcomes: Optional[Counter], outcome: str) -> None:
+    """
+    Count a download outcome, if the caller is collecting them.
+
+    >>> outcomes = Counter()
+    >>> _record_outcome(outcomes, "ok")
+    >>> _record_outcome(None, "ok")
+    >>> outcomes
+    Counter({'ok': 1})
+    """
+    if outcomes is not None:
+        with _OUTCOMES_LOCK:
+            outcomes[outcome] += 1
+
+
+def _download_mugshot(url: str, session: Optional[requests.Session] = None,
+                      outcomes: Optional[Counter] = None) -> Optional[bytes]:
     """
     Download a mugshot image from URL and return as bytes.
 
+    Mugshots downloaded in the last MUGSHOT_CACHE_TTL_SECONDS are read from
+    the disk cache. Older cached copies are revalidated with a conditional
+    request and reused if the server answers 304 Not Modified.
+
     Args:
         url: URL to mugshot image
+        session: Session to download with (default: a one-off request)
+        outcomes: Optional Counter of outcomes (cached, ok, 404, error, ...);
+            per-URL failures are then only logged at DEBUG level
 
     Returns:
         Image bytes or None if download fails
@@ -172,19 +487,97 @@ def _download_mugshot(url: str) -> Optional[bytes]:
     if not url:
         return None
 
+    # Per-URL failures are summarized by the caller when it counts outcomes
+    log_failure = logger.debug if outcomes is not None else logger.warning
+
+    image_path, validators_path = _mugshot_cache_paths(url)
+    headers = {}
+    try:
+        if time.time() - image_path.stat().st_mtime < MUGSHOT_CACHE_TTL_SECONDS:
+            image_bytes = image_path.read_bytes()
+            _record_outcome(outcomes, "cached")
+            return image_bytes
+        headers = json.loads(validators_path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cached mugshot for {url}: {str(e)}")
+
     try:
-        response = requests.get(url, timeout=10)
+        response = (session or requests).get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            image_path.touch()
+            validators_path.touch()
+            image_bytes = image_path.read_bytes()
+            _record_outcome(outcomes, "not_modified")
+            return image_bytes
+        _record_outcome(outcomes, "ok" if response.status_code == 200 else str(response.status_code))
         if response.status_code == 200:
+            _save_cached_mugshot(url, response)
             return response.content
+        elif response.status_code in (404, 410):
+            # Remember dead links so later reports skip them for a while
+            log_failure(f"Mugshot not found: {url} (status {response.status_code})")
+            try:
+                _write_private_file(_missing_mugshot_path(url), b'')
+            except OSError as e:
+                logger.warning(f"Failed to record missing mugshot {url}: {str(e)}")
+            return None
         else:
-            logger.warning(f"Failed to download mugshot: {url} (status {response.status_code})")
+            log_failure(f"Failed to download mugshot: {url} (status {response.status_code})")
             return None
     except Exception as e:
-        logger.warning(f"Error downloading mugshot from {url}: {str(e)}")
+        _record_outcome(outcomes, "error")
+        log_failure(f"Error downloading mugshot from {url}: {str(e)}")
         return None
 
 
-def _create_mugshot_image(image_bytes: bytes, width: int = 100, height: int = 125) -> Image:
+def _make_thumbnail(image_bytes: bytes) -> Optional[bytes]:
+    """
+    Shrink a downloaded mugshot to a small JPEG for embedding.
+
+    Full-size photos would otherwise be stored in the workbook as-is and
+    only scaled for display.
+
+    >>> buf = BytesIO()
+    >>> PILImage.new('RGB', (600, 750), 'gray').save(buf, 'PNG')
+    >>> PILImage.open(BytesIO(_make_thumbnail(buf.getvalue()))).size
+    (200, 250)
+
+    Args:
+        image_bytes: Raw image data
+
+    Returns:
+        JPEG bytes, or None if the data is not a readable image
+    """
+    try:
+        with PILImage.open(BytesIO(image_bytes)) as im:
+            thumbnail = im.convert("RGB").resize(MUGSHOT_THUMBNAIL_SIZE, PILImage.LANCZOS)
+        buf = BytesIO()
+        thumbnail.save(buf, format="JPEG", quality=80, optimize=True)
+        return buf.getvalue()
+    except Exception as e:
+        logger.warning(f"Skipping unreadable mugshot image: {str(e)}")
+        return None
+
+
+def _download_thumbnail(url: str, session: requests.Session, outcomes: Optional[Counter] = None) -> Optional[bytes]:
+    """
+    Download a mugshot and shrink it for embedding (runs in a worker thread).
+
+    Args:
+        url: URL to mugshot image
+        session: Shared download session
+        outcomes: Optional Counter of download outcomes
+
+    Returns:
+        JPEG thumbnail bytes, or None if the download or decode failed
+    """
+    image_bytes = _download_mugshot(url, session, outcomes)
+    return _make_thumbnail(image_bytes) if image_bytes else None
+
+
+def _create_mugshot_image(image_bytes: bytes, width: int = MUGSHOT_SIZE[0], height: int = MUGSHOT_SIZE[1]) -> Image:
     """
     Create a fresh openpyxl Image object from image bytes.
 
@@ -206,6 +599,20 @@ def _create_mugshot_image(image_bytes: bytes, width: int = 100, height: int = 12
     return img
 
 
+def _add_mugshots(ws, mugshot_rows: List[Tuple[int, str]], mugshot_images: Dict[str, bytes]):
+    """
+    Anchor a mugshot in column A of each listed row.
+
+    Args:
+        ws: Worksheet to add the images to
+        mugshot_rows: (row number, mugshot URL) pairs
+        mugshot_images: Downloaded mugshot bytes keyed by URL
+    """
+    for row_num, url in mugshot_rows:
+        # Create a fresh Image object for each row (can't reuse same Image)
+        ws.add_image(_create_mugshot_image(mugshot_images[url]), f'A{row_num}')
+
+
 def _download_mugshots_parallel(results: List[CustodyResult]) -> Dict[str, bytes]:
     """
     Download all mugshots for in-custody defendants in parallel.
@@ -214,7 +621,7 @@ def _download_mugshots_parallel(results: List[CustodyResult]) -> Dict[str, bytes
         results: List of CustodyResult objects
 
     Returns:
-        Dictionary mapping mugshot URL to image bytes
+        Dictionary mapping mugshot URL to JPEG thumbnail bytes
     """
     # Collect unique mugshot URLs for in-custody defendants
     mugshot_urls = set()
@@ -222,6 +629,14 @@ def _download_mugshots_parallel(results: List[CustodyResult]) -> Dict[str, bytes
         if result.in_custody and result.mugshot_url:
             mugshot_urls.add(result.mugshot_url)
 
+    _prune_mugshot_cache(time.time())
+
+    # Skip links that were recently not found
+    known_missing = {url for url in mugshot_urls if _is_known_missing_mugshot(url)}
+    if known_missing:
+        logger.info(f"Skipping {len(known_missing)} mugshots not found in a recent run")
+        mugshot_urls -= known_missing
+
     if not mugshot_urls:
         logger.info("No mugshots to download")
         return {}
@@ -229,31 +644,62 @@ def _download_mugshots_parallel(results: List[CustodyResult]) -> Dict[str, bytes
     logger.info(f"Downloading {len(mugshot_urls)} mugshots in parallel...")
 
     images = {}
-    with ThreadPoolExecutor(max_workers=10) as executor:
+    outcomes = Counter()
+    workers = min(MUGSHOT_WORKERS, len(mugshot_urls))
+    with _create_mugshot_session() as session, ThreadPoolExecutor(max_workers=workers) as executor:
         # Submit all download tasks
         future_to_url = {
-            executor.submit(_download_mugshot, url): url
+            executor.submit(_download_thumbnail, url, session, outcomes): url
             for url in mugshot_urls
         }
 
         # Collect results as they complete
-        completed = 0
         for future in as_completed(future_to_url):
             url = future_to_url[future]
             try:
                 image_bytes = future.result()
                 if image_bytes:
                     images[url] = image_bytes
-                    completed += 1
-                    if completed % 5 == 0:
-                        logger.info(f"Downloaded {completed}/{len(mugshot_urls)} mugshots")
             except Exception as e:
-                logger.error(f"Error downloading {url}: {str(e)}")
+                _record_outcome(outcomes, "error")
+                logger.debug(f"Error downloading {url}: {str(e)}")
 
-    logger.info(f"Successfully downloaded {len(images)}/{len(mugshot_urls)} mugshots")
+    # One summary line instead of a log call per URL
+    breakdown = ", ".join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items()))
+    logger.info(f"Successfully downloaded {len(images)}/{len(mugshot_urls)} mugshots ({breakdown})")
     return images
 
 
+def _styled_cell(ws, value=None, font=None, fill=None, border=None, alignment=None, style=None) -> WriteOnlyCell:
+    """
+    Create a cell for a write-only sheet, applying only the styles given.
+
+    Args:
+        ws: Write-only worksheet the cell will be appended to
+        value: Cell value
+        font: Optional Font
+        fill: Optional PatternFill
+        border: Optional Border
+        alignment: Optional Alignment
+        style: Optional name of a workbook named style, applied first
+
+    Returns:
+        WriteOnlyCell ready to pass to ws.append()
+    """
+    cell = WriteOnlyCell(ws, value=value)
+    if style is not None:
+        cell.style = style
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if border is not None:
+        cell.border = border
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
 def _create_summary_sheet(wb: Workbook, report: CustodyReport):
     """
     Create the Summary sheet in the Excel workbook.
@@ -264,17 +710,16 @@ def _create_summary_sheet(wb: Workbook, report: CustodyReport):
     """
     ws = wb.create_sheet("Summary")
 
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=14)
+    # Sheet layout must be set before the first row is written
+    ws.column_dimensions['A'].width = 30
+    ws.column_dimensions['B'].width = 40
+    ws.merged_cells.add('A1:B1')
 
     # Add title
-    ws['A1'] = "Custody Check Summary"
-    ws['A1'].font = Font(bold=True, size=16)
-    ws.merge_cells('A1:B1')
+    ws.append([_styled_cell(ws, "Custody Check Summary", font=_SUMMARY_TITLE_FONT)])
+    ws.append([])
 
     # Add report info
-    row = 3
     info_items = [
         ("Report Date:", report.search_date.strftime('%Y-%m-%d %H:%M:%S')),
         ("Source File:", report.source_file or "N/A"),
@@ -286,40 +731,23 @@ def _create_summary_sheet(wb: Workbook, report: CustodyReport):
     ]
 
     for label, value in info_items:
-        ws[f'A{row}'] = label
-        ws[f'B{row}'] = value
         if label:  # Bold the labels
-            ws[f'A{row}'].font = Font(bold=True)
-        row += 1
-
-    # Adjust column widths
-    ws.column_dimensions['A'].width = 30
-    ws.column_dimensions['B'].width = 40
+            ws.append([_styled_cell(ws, label, font=_LABEL_FONT), value])
+        else:
+            ws.append([label, value])
 
 
-def _create_all_results_sheet(wb: Workbook, report: CustodyReport):
+def _create_all_results_sheet(wb: Workbook, report: CustodyReport, mugshot_images: Dict[str, bytes]):
     """
     Create the All Results sheet in the Excel workbook with mugshots.
 
     Args:
         wb: Workbook object
         report: CustodyReport object
+        mugshot_images: Downloaded mugshot bytes keyed by URL
     """
     ws = wb.create_sheet("All Results")
 
-    # Download all mugshots in parallel first
-    mugshot_images = _download_mugshots_parallel(report.custody_results)
-
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
     # Headers (Mugshot column added as first column)
     headers = [
         "Mugshot",
@@ -334,56 +762,7 @@ def _create_all_results_sheet(wb: Workbook, report: CustodyReport):
         "Error Message"
     ]
 
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-
-    # Data rows
-    in_custody_fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")  # Light red
-    not_in_custody_fill = PatternFill(start_color="E6FFE6", end_color="E6FFE6", fill_type="solid")  # Light green
-    error_fill = PatternFill(start_color="FFF9E6", end_color="FFF9E6", fill_type="solid")  # Light yellow
-
-    # Sort results: IN CUSTODY first, then NOT IN CUSTODY
-    sorted_results = sorted(report.custody_results, key=lambda r: (not r.in_custody, r.defendant_name))
-
-    for row_num, result in enumerate(sorted_results, 2):
-        # Set row height for mugshots
-        ws.row_dimensions[row_num].height = 100
-
-        # Insert mugshot if available (column A)
-        if result.in_custody and result.mugshot_url and result.mugshot_url in mugshot_images:
-            # Create a fresh Image object for this row (can't reuse same Image)
-            img = _create_mugshot_image(mugshot_images[result.mugshot_url])
-            img.anchor = f'A{row_num}'
-            ws.add_image(img)
-
-        # Shift all data columns right by 1 (B, C, D, etc.)
-        ws.cell(row=row_num, column=2, value=result.matter_number)
-        ws.cell(row=row_num, column=3, value=result.case_number)
-        ws.cell(row=row_num, column=4, value=result.defendant_name)
-        ws.cell(row=row_num, column=5, value=result.status_summary)
-        ws.cell(row=row_num, column=6, value=result.booking_date)
-        ws.cell(row=row_num, column=7, value=result.booking_number)
-        ws.cell(row=row_num, column=8, value=result.charges_at_booking)
-        ws.cell(row=row_num, column=9, value=result.bond_amount)
-        ws.cell(row=row_num, column=10, value=result.error_message)
-
-        # Apply row coloring based on status
-        if result.error_message:
-            fill = error_fill
-        elif result.in_custody:
-            fill = in_custody_fill
-        else:
-            fill = not_in_custody_fill
-
-        for col in range(1, len(headers) + 1):
-            ws.cell(row=row_num, column=col).fill = fill
-            ws.cell(row=row_num, column=col).border = thin_border
-
-    # Adjust column widths
+    # Adjust column widths (before any rows are written)
     ws.column_dimensions['A'].width = 16  # Mugshot (100px wide images)
     ws.column_dimensions['B'].width = 15  # Matter Number
     ws.column_dimensions['C'].width = 20  # Case Number
@@ -398,44 +777,68 @@ def _create_all_results_sheet(wb: Workbook, report: CustodyReport):
     # Freeze header row
     ws.freeze_panes = 'A2'
 
+    ws.append([
+        _styled_cell(ws, header, font=_HEADER_FONT, fill=_HEADER_FILL,
+                     border=_THIN_BORDER, alignment=_CENTER)
+        for header in headers
+    ])
+
+    # Sort results: IN CUSTODY first, then NOT IN CUSTODY, each by name
+    by_name = attrgetter('defendant_name')
+    in_custody = sorted((r for r in report.custody_results if r.in_custody), key=by_name)
+    not_in_custody = sorted((r for r in report.custody_results if not r.in_custody), key=by_name)
+    sorted_results = in_custody + not_in_custody
+
+    # Mugshots (column A) are placed after the rows are written
+    mugshot_rows = []
+
+    for row_num, result in enumerate(sorted_results, 2):
+        # Set row height for mugshots
+        ws.row_dimensions[row_num].height = 100
+
+        if result.in_custody and result.mugshot_url in mugshot_images:
+            mugshot_rows.append((row_num, result.mugshot_url))
 
-def _create_in_custody_sheet(wb: Workbook, report: CustodyReport):
+        # Apply row coloring based on status
+        if result.error_message:
+            style = _ERROR_STYLE
+        elif result.in_custody:
+            style = _IN_CUSTODY_STYLE
+        else:
+            style = _NOT_IN_CUSTODY_STYLE
+
+        # Mugshot column is empty; data columns start at B
+        values = (
+            None,
+            result.matter_number,
+            result.case_number,
+            result.defendant_name,
+            result.status_summary,
+            result.booking_date,
+            result.booking_number,
+            result.charges_at_booking,
+            result.bond_amount,
+            result.error_message,
+        )
+        ws.append([_styled_cell(ws, value, style=style) for value in values])
+
+    _add_mugshots(ws, mugshot_rows, mugshot_images)
+
+
+def _create_in_custody_sheet(wb: Workbook, report: CustodyReport, mugshot_images: Dict[str, bytes]):
     """
     Create the In Custody sheet in the Excel workbook with mugshots.
 
     Args:
         wb: Workbook object
         report: CustodyReport object
+        mugshot_images: Downloaded mugshot bytes keyed by URL
     """
     ws = wb.create_sheet("In Custody Only")
 
     # Get in custody list first
     in_custody_list = report.get_in_custody_list()
 
-    # Download all mugshots in parallel
-    mugshot_images = _download_mugshots_parallel(in_custody_list)
-
-    # Title row (merged across all columns)
-    ws.merge_cells('A1:J1')
-    title_cell = ws['A1']
-    title_cell.value = "DEFENDANTS IN CUSTODY"
-    title_cell.font = Font(bold=True, size=14, color="FFFFFF")
-    title_cell.fill = PatternFill(start_color="8B0000", end_color="8B0000", fill_type="solid")
-    title_cell.alignment = Alignment(horizontal='center', vertical='center')
-
-    # Row 2: Empty row
-    ws.row_dimensions[2].height = 5
-
-    # Header style
-    header_fill = PatternFill(start_color="C00000", end_color="C00000", fill_type="solid")  # Dark red
-    header_font = Font(bold=True, color="FFFFFF")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
     # Headers at row 3 (Mugshot added as first column)
     headers = [
         "Mugshot",
@@ -450,54 +853,7 @@ def _create_in_custody_sheet(wb: Workbook, report: CustodyReport):
         "Case Status"
     ]
 
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=3, column=col_num, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-
-    # Data rows start at row 4 - only in custody
-    highlight_fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")  # Light red
-
-    for row_num, result in enumerate(in_custody_list, 4):
-        # Set row height for mugshots
-        ws.row_dimensions[row_num].height = 100
-
-        # Insert mugshot if available (column A)
-        if result.mugshot_url and result.mugshot_url in mugshot_images:
-            # Create a fresh Image object for this row (can't reuse same Image)
-            img = _create_mugshot_image(mugshot_images[result.mugshot_url])
-            img.anchor = f'A{row_num}'
-            ws.add_image(img)
-
-        # Shift all data columns right by 1 (B, C, D, etc.)
-        ws.cell(row=row_num, column=2, value=result.matter_number)
-        ws.cell(row=row_num, column=3, value=result.case_number)
-        ws.cell(row=row_num, column=4, value=result.defendant_name)
-        ws.cell(row=row_num, column=5, value=result.booking_date)
-        ws.cell(row=row_num, column=6, value=result.booking_number)
-        ws.cell(row=row_num, column=7, value=result.charges_at_booking)
-        ws.cell(row=row_num, column=8, value=result.bond_amount)
-
-        # Look up original charges and case status from defendant
-        original_charges = None
-        case_status = None
-        for d in report.defendants_checked:
-            if d.full_name == result.defendant_name and d.case_number == result.case_number:
-                original_charges = d.charges
-                case_status = d.case_status
-                break
-
-        ws.cell(row=row_num, column=9, value=original_charges)
-        ws.cell(row=row_num, column=10, value=case_status)
-
-        # Apply highlight coloring
-        for col in range(1, len(headers) + 1):
-            ws.cell(row=row_num, column=col).fill = highlight_fill
-            ws.cell(row=row_num, column=col).border = thin_border
-
-    # Adjust column widths
+    # Adjust column widths (before any rows are written)
     ws.column_dimensions['A'].width = 16  # Mugshot (100px wide images)
     ws.column_dimensions['B'].width = 15  # Matter Number
     ws.column_dimensions['C'].width = 20  # Case Number
@@ -512,6 +868,65 @@ def _create_in_custody_sheet(wb: Workbook, report: CustodyReport):
     # Freeze panes at row 4 (after title, empty row, and headers)
     ws.freeze_panes = 'A4'
 
+    # Title row (merged across all columns)
+    ws.merged_cells.add('A1:J1')
+    ws.append([_styled_cell(
+        ws,
+        "DEFENDANTS IN CUSTODY",
+        font=_CUSTODY_TITLE_FONT,
+        fill=_CUSTODY_TITLE_FILL,
+        alignment=_CENTER
+    )])
+
+    # Row 2: Empty row
+    ws.row_dimensions[2].height = 5
+    ws.append([])
+
+    ws.append([
+        _styled_cell(ws, header, font=_HEADER_FONT, fill=_CUSTODY_HEADER_FILL,
+                     border=_THIN_BORDER, alignment=_CENTER)
+        for header in headers
+    ])
+
+    # Original charges and case status by (name, case number); the first
+    # matching defendant wins
+    defendant_details = {}
+    for d in report.defendants_checked:
+        defendant_details.setdefault((d.full_name, d.case_number), (d.charges, d.case_status))
+
+    # Mugshots (column A) are placed after the rows are written
+    mugshot_rows = []
+
+    # Data rows start at row 4 - only in custody
+    for row_num, result in enumerate(in_custody_list, 4):
+        # Set row height for mugshots
+        ws.row_dimensions[row_num].height = 100
+
+        if result.mugshot_url in mugshot_images:
+            mugshot_rows.append((row_num, result.mugshot_url))
+
+        # Look up original charges and case status from defendant
+        original_charges, case_status = defendant_details.get(
+            (result.defendant_name, result.case_number), (None, None)
+        )
+
+        # Mugshot column is empty; data columns start at B
+        values = (
+            None,
+            result.matter_number,
+            result.case_number,
+            result.defendant_name,
+            result.booking_date,
+            result.booking_number,
+            result.charges_at_booking,
+            result.bond_amount,
+            original_charges,
+            case_status,
+        )
+        ws.append([_styled_cell(ws, value, style=_IN_CUSTODY_STYLE) for value in values])
+
+    _add_mugshots(ws, mugshot_rows, mugshot_images)
+
 
 if __name__ == "__main__":
     import doctest
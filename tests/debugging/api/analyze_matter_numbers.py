@@ -1,5 +1,6 @@
+import math
 import pdfplumber
-from collections import Counter
+from collections import Counter, defaultdict
 
 pdf = pdfplumber.open(r'C:\Github\jail-checker\input\Prosecutor Worklist Report.pdf')
 
@@ -13,16 +14,29 @@ for page_num, page in enumerate(pdf.pages, 1):
     # Find matter numbers (left column, contains dash)
     matter_words = [w for w in words if w['x0'] < 100 and '-' in w['text'] and len(w['text']) > 3]
 
+    # Index case numbers by row so each matter only checks nearby rows
+    case_rows = defaultdict(list)
+    for i, w in enumerate(words):
+        if 'GS' in w['text'] and 100 < w['x0'] < 200:
+            case_rows[math.floor(w['top'])].append((i, w))
+
     # Find case numbers on same rows
     for matter_word in matter_words:
         matter_num = matter_word['text']
         all_matter_numbers.append(matter_num)
 
-        # Find case number on same row
-        case_words = [w for w in words if 'GS' in w['text'] and 100 < w['x0'] < 200 and abs(w['top'] - matter_word['top']) < 1]
+        # Find case number on same row (within 1pt, so at most 3 buckets)
+        row = math.floor(matter_word['top'])
+        case_words = [
+            (i, w)
+            for bucket in (row - 1, row, row + 1)
+            for i, w in case_rows.get(bucket, ())
+            if abs(w['top'] - matter_word['top']) < 1
+        ]
 
         if case_words:
-            case_num = case_words[0]['text'].rstrip(',')
+            # First match in page order, as the full scan returned
+            case_num = min(case_words, key=lambda iw: iw[0])[1]['text'].rstrip(',')
             if matter_num not in matter_to_cases:
                 matter_to_cases[matter_num] = []
             matter_to_cases[matter_num].append({
@@ -3,25 +3,74 @@ Script to reverse-engineer the Dorchester County jail search API.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Target URL
 BASE_URL = "https://cc.southernsoftware.com/bookingsearch/index.php?AgencyID=DorchesterCoSC"
 
+# AJAX/API endpoints referenced in the page: absolute and relative .php URLs
+# and url:/fetch()/ajax() arguments, as one alternation so the page is scanned
+# once. Every repeat is length-bounded so long tokens without a match can't
+# make the scan backtrack quadratically.
+_API_ENDPOINT_PATTERN = re.compile(
+    r'(?P<absphp>https?://[^\s\'"]{1,512}\.php[^\s\'"]{0,512})'
+    r'|(?P<relphp>/[a-zA-Z0-9_/]{1,512}\.php[^\s\'"]{0,512})'
+    r'|url\s{0,16}:\s{0,16}[\'"](?P<url>[^\'"]{1,512})[\'"]'
+    r'|fetch\([\'"](?P<fetch>[^\'"]{1,512})[\'"]'
+    r'|ajax\([\'"](?P<ajax>[^\'"]{1,512})[\'"]'
+)
+
+# Tags that carry form values
+FORM_FIELD_TAGS = ('input', 'select', 'textarea')
+
+# One pooled keep-alive session for every request to the booking site
+SESSION = requests.Session()
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+def collect_page_tags(soup):
+    """
+    Collect forms (with their inputs) and scripts in one pass over the page.
+
+    Returns:
+        (forms, external_scripts, inline_scripts), where forms is a list of
+        (form, inputs) pairs in document order
+    """
+    forms, external_scripts, inline_scripts = [], [], []
+    form_inputs = {}
+    for el in soup.descendants:
+        name = getattr(el, 'name', None)
+        if name == 'form':
+            form_inputs[id(el)] = []
+            forms.append((el, form_inputs[id(el)]))
+        elif name in FORM_FIELD_TAGS:
+            form = el.find_parent('form')
+            if form is not None and id(form) in form_inputs:
+                form_inputs[id(form)].append(el)
+        elif name == 'script':
+            (external_scripts if 'src' in el.attrs else inline_scripts).append(el)
+    return forms, external_scripts, inline_scripts
+
+
 def fetch_search_page():
     """Fetch the main search page and analyze its structure."""
     print("=" * 80)
     print("STEP 1: Fetching search page HTML")
     print("=" * 80)
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-
     try:
-        response = requests.get(BASE_URL, headers=headers, timeout=30)
+        response = SESSION.get(BASE_URL, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Content-Type: {response.headers.get('Content-Type', 'N/A')}")
         print(f"Content-Length: {len(response.text)} bytes\n")
@@ -33,22 +82,21 @@ def fetch_search_page():
             print("[OK] Saved HTML to search_page.html\n")
 
             # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
+            forms, scripts, inline_scripts = collect_page_tags(soup)
 
             # Find all forms
             print("-" * 80)
             print("FORMS FOUND:")
             print("-" * 80)
-            forms = soup.find_all('form')
-            for i, form in enumerate(forms, 1):
+            for i, (form, inputs) in enumerate(forms, 1):
                 print(f"\nForm #{i}:")
                 print(f"  Action: {form.get('action', 'N/A')}")
                 print(f"  Method: {form.get('method', 'N/A')}")
                 print(f"  ID: {form.get('id', 'N/A')}")
                 print(f"  Name: {form.get('name', 'N/A')}")
 
-                # Find all inputs in this form
-                inputs = form.find_all(['input', 'select', 'textarea'])
+                # All inputs in this form
                 if inputs:
                     print(f"  Inputs ({len(inputs)}):")
                     for inp in inputs:
@@ -62,7 +110,6 @@ def fetch_search_page():
             print("\n" + "-" * 80)
             print("JAVASCRIPT FILES REFERENCED:")
             print("-" * 80)
-            scripts = soup.find_all('script', src=True)
             for script in scripts:
                 print(f"  - {script.get('src')}")
 
@@ -70,7 +117,6 @@ def fetch_search_page():
             print("\n" + "-" * 80)
             print("INLINE JAVASCRIPT:")
             print("-" * 80)
-            inline_scripts = soup.find_all('script', src=False)
             for i, script in enumerate(inline_scripts, 1):
                 script_content = script.string
                 if script_content and len(script_content.strip()) > 0:
@@ -89,22 +135,10 @@ def fetch_search_page():
             print("POTENTIAL API ENDPOINTS IN HTML:")
             print("-" * 80)
             # Search for common patterns
-            api_patterns = [
-                r'(https?://[^\s\'"]+\.php[^\s\'"]*)',
-                r'(\/[a-zA-Z0-9_\/]+\.php[^\s\'"]*)',
-                r'url\s*:\s*[\'"]([^\'"]+)[\'"]',
-                r'fetch\([\'"]([^\'"]+)[\'"]',
-                r'ajax\([\'"]([^\'"]+)[\'"]',
-            ]
-
-            found_endpoints = set()
-            for pattern in api_patterns:
-                matches = re.findall(pattern, response.text)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        found_endpoints.update(match)
-                    else:
-                        found_endpoints.add(match)
+            found_endpoints = {
+                match.group(match.lastgroup)
+                for match in _API_ENDPOINT_PATTERN.finditer(response.text)
+            }
 
             if found_endpoints:
                 for endpoint in sorted(found_endpoints):
@@ -121,7 +155,7 @@ def fetch_search_page():
                 f.write(response.text)
             print("[OK] Saved error page to search_page.html for analysis\n")
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
             return response, soup
 
     except Exception as e:
@@ -138,7 +172,6 @@ def test_search_submission(soup):
     print("=" * 80)
 
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
         'Referer': BASE_URL,
@@ -173,7 +206,7 @@ def test_search_submission(soup):
     print(f"Submission URL: {submit_url}\n")
 
     # Collect form inputs and build payload
-    inputs = form.find_all(['input', 'select', 'textarea'])
+    inputs = form.find_all(FORM_FIELD_TAGS)
     payload = {}
 
     for inp in inputs:
@@ -183,9 +216,10 @@ def test_search_submission(soup):
 
         if inp_name:
             # Set default values for common fields
-            if 'name' in inp_name.lower() and 'last' in inp_name.lower():
+            lower_name = inp_name.lower()
+            if 'name' in lower_name and 'last' in lower_name:
                 payload[inp_name] = 'Smith'
-            elif 'name' in inp_name.lower() and 'first' in inp_name.lower():
+            elif 'name' in lower_name and 'first' in lower_name:
                 payload[inp_name] = 'John'
             elif inp_type == 'hidden':
                 payload[inp_name] = inp_value
@@ -208,9 +242,9 @@ def test_search_submission(soup):
         print(f"\nSubmitting {method} request...")
 
         if method == 'POST':
-            response = requests.post(submit_url, data=payload, headers=headers, timeout=30, allow_redirects=True)
+            response = SESSION.post(submit_url, data=payload, headers=headers, timeout=30, allow_redirects=True)
         else:
-            response = requests.get(submit_url, params=payload, headers=headers, timeout=30, allow_redirects=True)
+            response = SESSION.get(submit_url, params=payload, headers=headers, timeout=30, allow_redirects=True)
 
         print(f"Response Status: {response.status_code}")
         print(f"Response URL: {response.url}")
@@ -236,7 +270,7 @@ def test_search_submission(soup):
         else:
             print("\nResponse format: HTML")
             # Parse results
-            result_soup = BeautifulSoup(response.text, 'html.parser')
+            result_soup = BeautifulSoup(response.text, 'lxml')
 
             # Look for result tables
             tables = result_soup.find_all('table')
@@ -280,19 +314,26 @@ def check_for_api_endpoints():
         '/search/',
     ]
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-
-    for path in common_paths:
-        url = f"https://cc.southernsoftware.com{path}"
+    def probe(url):
         try:
-            response = requests.head(url, headers=headers, timeout=10, allow_redirects=False)
-            print(f"{url}: {response.status_code}")
-            if response.status_code in [200, 301, 302]:
-                print(f"  -> Might be valid!")
+            # stream=True: never read a body, even if a server sends one to HEAD
+            with SESSION.head(url, timeout=10, allow_redirects=False, stream=True) as response:
+                return response.status_code
         except:
+            return None
+
+    # Probe all paths at once, then report in order
+    urls = [f"https://cc.southernsoftware.com{path}" for path in common_paths]
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        status_codes = list(executor.map(probe, urls))
+
+    for url, status_code in zip(urls, status_codes):
+        if status_code is None:
             print(f"{url}: No response")
+            continue
+        print(f"{url}: {status_code}")
+        if status_code in [200, 301, 302]:
+            print(f"  -> Might be valid!")
 
 
 if __name__ == "__main__":
@@ -5,15 +5,32 @@ This script tests each endpoint that was discovered through reverse engineering
 the booking search website.
 """
 
+import io
+import re
 import requests
 import json
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from pathlib import Path
 from datetime import datetime, timedelta
 
+# requests-cache is optional; when installed, repeat runs within 5 minutes
+# reuse the saved responses instead of hitting the live site again
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
 # Base configuration
 BASE_URL = "https://cc.southernsoftware.com/bookingsearch"
 AGENCY_ID = "SC018013C"  # Dorchester County JMS Agency ID
 
+# Raw responses are saved next to the other captured pages for inspection
+DEBUG_DIR = Path(__file__).parent.parent / 'html'
+
 # Standard headers to mimic browser requests
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -23,8 +40,141 @@ HEADERS = {
     'Content-Type': 'application/x-www-form-urlencoded',
 }
 
+# One pooled keep-alive session for every request to the booking site
+if requests_cache is not None:
+    # Owner-only directory and JSON rather than the default pickle serializer,
+    # so other local users can't plant responses or code in the cache
+    API_CACHE_DIR = Path.home() / '.cache' / 'jail-checker'
+    API_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    SESSION = requests_cache.CachedSession(
+        str(API_CACHE_DIR / 'api_debug_cache'),
+        backend='sqlite',
+        serializer='json',
+        expire_after=300,
+        allowable_methods=('GET', 'HEAD', 'POST'),  # the search endpoints are all POSTs
+    )
+else:
+    SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+# Only result cards are inspected, so skip building the rest of the page.
+# Cards carry several classes ("card index-agency-card"), which a plain
+# class_='card' strainer does not match while parsing.
+CARD_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)card(\s|$)'))
+
+
+def save_response(filename, response):
+    """Save a response body, as received, to DEBUG_DIR/filename."""
+    (DEBUG_DIR / filename).write_bytes(response.content)
+
 
-def test_search_by_name(first_name="", middle_name="", last_name=""):
+def stream_card_texts(response, save_path):
+    """
+    Save a streamed response to disk while parsing its div.card elements.
+
+    Cards are yielded (as their stripped text) as soon as they are complete and
+    then discarded, so only one card is held in memory instead of the page.
+
+    Args:
+        response: Response opened with stream=True
+        save_path: File to write the raw body to
+
+    Yields:
+        Text of each card, in document order
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='div', encoding=response.encoding)
+
+    def completed_cards():
+        for _, elem in parser.read_events():
+            if 'card' in (elem.get('class') or '').split():
+                yield ''.join(text.strip() for text in elem.itertext())
+                # Free the card and everything parsed before it
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    with open(save_path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            f.write(chunk)
+            parser.feed(chunk)
+            yield from completed_cards()
+    parser.close()
+    yield from completed_cards()
+
+
+def call_endpoint(url, payload, filename, count_label, sample_label=None, stream=False, out=None):
+    """
+    POST to an endpoint, save the response and report the result cards in it.
+
+    Args:
+        url: Endpoint URL
+        payload: Form data to post
+        filename: File in DEBUG_DIR to save the raw response to
+        count_label: Printed before the number of cards found
+        sample_label: If given, print the first card's text under this heading
+        stream: Parse the body as it downloads (for very large listings)
+        out: Stream to print to (default: sys.stdout)
+
+    Returns:
+        Path of the saved response, or None if the request failed
+    """
+    print(f"URL: {url}", file=out)
+    print(f"Payload: {payload}\n", file=out)
+
+    save_path = DEBUG_DIR / filename
+
+    try:
+        if stream:
+            with SESSION.post(url, data=payload, stream=True, timeout=30) as response:
+                print(f"Status Code: {response.status_code}", file=out)
+
+                if response.status_code != 200:
+                    print(f"[ERROR] Request failed: {response.status_code}", file=out)
+                    return None
+
+                card_count = 0
+                first_card_text = None
+                for text in stream_card_texts(response, save_path):
+                    card_count += 1
+                    if first_card_text is None:
+                        first_card_text = text
+
+            print(f"Content Length: {save_path.stat().st_size} bytes", file=out)
+        else:
+            response = SESSION.post(url, data=payload, timeout=30)
+            print(f"Status Code: {response.status_code}", file=out)
+            print(f"Content Length: {len(response.content)} bytes", file=out)
+
+            if response.status_code != 200:
+                print(f"[ERROR] Request failed: {response.status_code}", file=out)
+                return None
+
+            save_response(filename, response)
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=CARD_STRAINER)
+            cards = soup.find_all('div', class_='card')
+            card_count = len(cards)
+            first_card_text = cards[0].get_text(strip=True) if cards else None
+
+        print(f"[OK] Saved response to {filename}", file=out)
+        print(f"\n{count_label}: {card_count} records", file=out)
+
+        if sample_label and first_card_text:
+            print(f"\n{sample_label}:", file=out)
+            print(first_card_text[:500], file=out)
+
+        return save_path
+
+    except Exception as e:
+        print(f"[ERROR] Exception: {e}", file=out)
+        return None
+
+
+def test_search_by_name(first_name="", middle_name="", last_name="", out=None):
     """
     Search for inmates by name.
 
@@ -37,9 +187,9 @@ def test_search_by_name(first_name="", middle_name="", last_name=""):
         lastname: Last name (partial match allowed)
         searchtype: 'name'
     """
-    print("\n" + "=" * 80)
-    print("TEST: Search by Name")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Search by Name", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_incident_search_name.php"
 
@@ -50,47 +200,12 @@ def test_search_by_name(first_name="", middle_name="", last_name=""):
         'lastname': last_name,
     }
 
-    print(f"Searching for: First='{first_name}', Middle='{middle_name}', Last='{last_name}'")
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
-
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
-
-        if response.status_code == 200:
-            # Save response
-            with open('C:\\Github\\jail-checker\\test_name_search.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_name_search.html")
-
-            # Parse and extract key info
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Look for result cards or tables
-            cards = soup.find_all('div', class_='card')
-            print(f"\nResults found: {len(cards)} records")
-
-            # Try to extract some sample data
-            if cards and len(cards) > 0:
-                print("\nSample result (first record):")
-                first_card = cards[0]
-                text = first_card.get_text(strip=True)
-                if text:
-                    print(text[:500])  # First 500 chars
+    print(f"Searching for: First='{first_name}', Middle='{middle_name}', Last='{last_name}'", file=out)
+    return call_endpoint(url, payload, 'test_name_search.html', "Results found",
+                         sample_label="Sample result (first record)", out=out)
 
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
 
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
-
-
-def test_current_confinements():
+def test_current_confinements(out=None):
     """
     Get all current inmates in custody.
 
@@ -104,9 +219,9 @@ def test_current_confinements():
         sort: Sort order (name, date, etc.)
         IDX: Page index for pagination (optional)
     """
-    print("\n" + "=" * 80)
-    print("TEST: Get Current Confinements")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Get Current Confinements", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_current_confinements.php"
 
@@ -117,45 +232,12 @@ def test_current_confinements():
         'sort': 'name',
     }
 
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
+    # The full list of inmates is large, so it is parsed as it downloads
+    return call_endpoint(url, payload, 'test_current_confinements.html', "Current inmates in custody",
+                         sample_label="Sample inmate record", stream=True, out=out)
 
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
 
-        if response.status_code == 200:
-            # Save response
-            with open('C:\\Github\\jail-checker\\test_current_confinements.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_current_confinements.html")
-
-            # Parse and extract info
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Look for inmate records
-            cards = soup.find_all('div', class_='card')
-            print(f"\nCurrent inmates in custody: {len(cards)} records")
-
-            if cards and len(cards) > 0:
-                print("\nSample inmate record:")
-                first_card = cards[0]
-                text = first_card.get_text(strip=True)
-                if text:
-                    print(text[:500])
-
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
-
-
-def test_last_24_hours():
+def test_last_24_hours(out=None):
     """
     Get inmates admitted in the last 24 hours.
 
@@ -166,9 +248,9 @@ def test_last_24_hours():
         JMSAgencyID: Agency identifier
         IDX: Page index for pagination (optional)
     """
-    print("\n" + "=" * 80)
-    print("TEST: Get Last 24 Hours Admits")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Get Last 24 Hours Admits", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_last24hours.php"
 
@@ -176,34 +258,10 @@ def test_last_24_hours():
         'JMSAgencyID': AGENCY_ID,
     }
 
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
-
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
-
-        if response.status_code == 200:
-            with open('C:\\Github\\jail-checker\\test_last24hours.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_last24hours.html")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            cards = soup.find_all('div', class_='card')
-            print(f"\nAdmits in last 24 hours: {len(cards)} records")
-
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
+    return call_endpoint(url, payload, 'test_last24hours.html', "Admits in last 24 hours", stream=True, out=out)
 
 
-def test_date_range_admits(begin_date, end_date):
+def test_date_range_admits(begin_date, end_date, out=None):
     """
     Get inmates admitted within a date range.
 
@@ -216,9 +274,9 @@ def test_date_range_admits(begin_date, end_date):
         enddate: End date (MM/DD/YYYY)
         customRadioInline1: 'customdate' or 'last24hours' or 'currentweek'
     """
-    print("\n" + "=" * 80)
-    print("TEST: Search Admits by Date Range")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Search Admits by Date Range", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_incident_search_dates_admit.php"
 
@@ -229,35 +287,11 @@ def test_date_range_admits(begin_date, end_date):
         'customRadioInline1': 'customdate',
     }
 
-    print(f"Date range: {begin_date} to {end_date}")
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
-
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
-
-        if response.status_code == 200:
-            with open('C:\\Github\\jail-checker\\test_daterange_admits.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_daterange_admits.html")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            cards = soup.find_all('div', class_='card')
-            print(f"\nAdmits in date range: {len(cards)} records")
-
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
+    print(f"Date range: {begin_date} to {end_date}", file=out)
+    return call_endpoint(url, payload, 'test_daterange_admits.html', "Admits in date range", out=out)
 
 
-def test_date_range_releases(begin_date, end_date):
+def test_date_range_releases(begin_date, end_date, out=None):
     """
     Get inmates released within a date range.
 
@@ -270,9 +304,9 @@ def test_date_range_releases(begin_date, end_date):
         enddate: End date (MM/DD/YYYY)
         customRadioInline1: 'customdate' or 'last24hours' or 'currentweek'
     """
-    print("\n" + "=" * 80)
-    print("TEST: Search Releases by Date Range")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Search Releases by Date Range", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_incident_search_dates_release.php"
 
@@ -283,35 +317,11 @@ def test_date_range_releases(begin_date, end_date):
         'customRadioInline1': 'customdate',
     }
 
-    print(f"Date range: {begin_date} to {end_date}")
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
-
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
-
-        if response.status_code == 200:
-            with open('C:\\Github\\jail-checker\\test_daterange_releases.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_daterange_releases.html")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            cards = soup.find_all('div', class_='card')
-            print(f"\nReleases in date range: {len(cards)} records")
-
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
+    print(f"Date range: {begin_date} to {end_date}", file=out)
+    return call_endpoint(url, payload, 'test_daterange_releases.html', "Releases in date range", out=out)
 
 
-def test_search_by_charge(charge):
+def test_search_by_charge(charge, out=None):
     """
     Search for inmates by charge/offense.
 
@@ -321,9 +331,9 @@ def test_search_by_charge(charge):
     Parameters:
         charge: Charge description (partial match allowed)
     """
-    print("\n" + "=" * 80)
-    print("TEST: Search by Charge")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Search by Charge", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_incident_search_charge.php"
 
@@ -331,35 +341,11 @@ def test_search_by_charge(charge):
         'charge': charge,
     }
 
-    print(f"Searching for charge: '{charge}'")
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
+    print(f"Searching for charge: '{charge}'", file=out)
+    return call_endpoint(url, payload, 'test_charge_search.html', f"Results with charge '{charge}'", out=out)
 
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
-
-        if response.status_code == 200:
-            with open('C:\\Github\\jail-checker\\test_charge_search.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_charge_search.html")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            cards = soup.find_all('div', class_='card')
-            print(f"\nResults with charge '{charge}': {len(cards)} records")
-
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
 
-
-def test_search_by_arresting_agency(agency):
+def test_search_by_arresting_agency(agency, out=None):
     """
     Search for inmates by arresting agency.
 
@@ -369,9 +355,9 @@ def test_search_by_arresting_agency(agency):
     Parameters:
         ArrestAgency: Agency name/code
     """
-    print("\n" + "=" * 80)
-    print("TEST: Search by Arresting Agency")
-    print("=" * 80)
+    print("\n" + "=" * 80, file=out)
+    print("TEST: Search by Arresting Agency", file=out)
+    print("=" * 80, file=out)
 
     url = f"{BASE_URL}/fetchesforajax/fetch_incident_search_arrestagency.php"
 
@@ -379,75 +365,52 @@ def test_search_by_arresting_agency(agency):
         'ArrestAgency': agency,
     }
 
-    print(f"Searching for agency: '{agency}'")
-    print(f"URL: {url}")
-    print(f"Payload: {payload}\n")
-
-    try:
-        response = requests.post(url, headers=HEADERS, data=payload, timeout=30)
-        print(f"Status Code: {response.status_code}")
-        print(f"Content Length: {len(response.text)} bytes")
-
-        if response.status_code == 200:
-            with open('C:\\Github\\jail-checker\\test_agency_search.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            print("[OK] Saved response to test_agency_search.html")
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            cards = soup.find_all('div', class_='card')
-            print(f"\nResults for agency '{agency}': {len(cards)} records")
-
-            return response.text
-        else:
-            print(f"[ERROR] Request failed: {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"[ERROR] Exception: {e}")
-        return None
+    print(f"Searching for agency: '{agency}'", file=out)
+    return call_endpoint(url, payload, 'test_agency_search.html', f"Results for agency '{agency}'", out=out)
 
 
 def run_all_tests():
-    """Run all test cases."""
+    """Run all test cases concurrently, printing each one's output in order."""
     print("\n")
     print("*" * 80)
     print("DORCHESTER COUNTY JAIL API - COMPREHENSIVE TEST SUITE")
     print("*" * 80)
 
-    # Test 1: Current confinements (most important for your use case)
-    test_current_confinements()
-
-    # Test 2: Last 24 hours
-    test_last_24_hours()
-
-    # Test 3: Search by name (test with common name)
-    test_search_by_name(first_name="", middle_name="", last_name="Smith")
-
-    # Test 4: Date range admits (last 7 days)
     today = datetime.now()
     week_ago = today - timedelta(days=7)
-    test_date_range_admits(
-        week_ago.strftime("%m/%d/%Y"),
-        today.strftime("%m/%d/%Y")
-    )
-
-    # Test 5: Date range releases (last 7 days)
-    test_date_range_releases(
-        week_ago.strftime("%m/%d/%Y"),
-        today.strftime("%m/%d/%Y")
-    )
-
-    # Test 6: Search by charge
-    test_search_by_charge("DUI")
 
-    # Test 7: Search by agency
-    test_search_by_arresting_agency("SUMMERVILLE - SC0180200")
+    tests = [
+        # Test 1: Current confinements (most important for your use case)
+        (test_current_confinements, ()),
+        # Test 2: Last 24 hours
+        (test_last_24_hours, ()),
+        # Test 3: Search by name (test with common name)
+        (test_search_by_name, ("", "", "Smith")),
+        # Test 4: Date range admits (last 7 days)
+        (test_date_range_admits, (week_ago.strftime("%m/%d/%Y"), today.strftime("%m/%d/%Y"))),
+        # Test 5: Date range releases (last 7 days)
+        (test_date_range_releases, (week_ago.strftime("%m/%d/%Y"), today.strftime("%m/%d/%Y"))),
+        # Test 6: Search by charge
+        (test_search_by_charge, ("DUI",)),
+        # Test 7: Search by agency
+        (test_search_by_arresting_agency, ("SUMMERVILLE - SC0180200",)),
+    ]
+
+    # The requests are independent, so run them together on the shared SESSION.
+    # Each test prints into its own buffer, shown in order once all are done
+    outputs = [io.StringIO() for _ in tests]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(fn, *args, out=out) for (fn, args), out in zip(tests, outputs)]
+
+    for future, output in zip(futures, outputs):
+        print(output.getvalue(), end='')
+        future.result()
 
     print("\n")
     print("*" * 80)
     print("ALL TESTS COMPLETE")
     print("*" * 80)
-    print("\nCheck the following files for detailed responses:")
+    print(f"\nCheck the following files in {DEBUG_DIR} for detailed responses:")
     print("  - test_current_confinements.html (all current inmates)")
     print("  - test_last24hours.html (recent admits)")
     print("  - test_name_search.html (name search results)")
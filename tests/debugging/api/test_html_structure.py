@@ -1,7 +1,8 @@
 """Test script to see what HTML structure the live API returns."""
 
+import re
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 
 # Set up session
@@ -54,8 +55,9 @@ with open(r'C:\Github\jail-checker\tests\debugging\html\debug_live_api_response.
 print("Saved full HTML to debug_live_api_response.html")
 print()
 
-# Parse and check structure
-soup = BeautifulSoup(response.text, 'html.parser')
+# Parse and check structure (booking cards only)
+BOOKING_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)booking-card(\s|$)'))
+soup = BeautifulSoup(response.text, 'lxml', parse_only=BOOKING_STRAINER)
 
 # Try to find booking cards
 booking_cards = soup.find_all('div', class_='booking-card')
@@ -64,7 +66,7 @@ print(f"Found {len(booking_cards)} booking cards")
 if booking_cards:
     first_card = booking_cards[0]
     print("\n=== First Card HTML ===")
-    print(first_card.prettify()[:1000])
+    print(str(first_card)[:1000])
     print()
 
     # Check for detail rows
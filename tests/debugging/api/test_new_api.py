@@ -11,29 +11,28 @@ print("=" * 80)
 print("TESTING UPDATED JAIL API")
 print("=" * 80)
 
-# Test with Avery Arron Adams (we know he's in custody)
-print("\n[Test 1] Known inmate: AVERY ARRON ADAMS")
-defendant1 = Defendant(last_name="ADAMS", first_name="AVERY", middle_name="ARRON")
-client = JailAPIClient()
-result1 = client.check_custody(defendant1)
-print(f"  Result: {result1.status_summary}")
-print(f"  In Custody: {result1.in_custody}")
+tests = [
+    # Test with Avery Arron Adams (we know he's in custody)
+    ("[Test 1] Known inmate: AVERY ARRON ADAMS",
+     Defendant(last_name="ADAMS", first_name="AVERY", middle_name="ARRON")),
+    # Test with someone we know is NOT in custody
+    ("[Test 2] Known non-inmate: John Smith",
+     Defendant(last_name="Smith", first_name="John")),
+    # Test with another known inmate
+    ("[Test 3] Known inmate: DALTON LOREN ADAMS",
+     Defendant(last_name="ADAMS", first_name="DALTON", middle_name="LOREN")),
+]
 
-# Test with someone we know is NOT in custody
-print("\n[Test 2] Known non-inmate: John Smith")
-defendant2 = Defendant(last_name="Smith", first_name="John")
-result2 = client.check_custody(defendant2)
-print(f"  Result: {result2.status_summary}")
-print(f"  In Custody: {result2.in_custody}")
+with JailAPIClient() as client:
+    # Fetch the confinement list once; each check is then an in-memory
+    # lookup (as in main.check_custody_for_all)
+    client.load_current_confinements()
+    results = [client.check_custody(defendant) for _, defendant in tests]
 
-# Test with another known inmate
-print("\n[Test 3] Known inmate: DALTON LOREN ADAMS")
-defendant3 = Defendant(last_name="ADAMS", first_name="DALTON", middle_name="LOREN")
-result3 = client.check_custody(defendant3)
-print(f"  Result: {result3.status_summary}")
-print(f"  In Custody: {result3.in_custody}")
-
-client.close()
+for (label, _), result in zip(tests, results):
+    print(f"\n{label}")
+    print(f"  Result: {result.status_summary}")
+    print(f"  In Custody: {result.in_custody}")
 
 print("\n" + "=" * 80)
 print("TEST COMPLETE")
@@ -8,29 +8,32 @@ This script:
 4. Verifies we get "in custody" result
 """
 
+import re
 import sys
+import atexit
 sys.path.insert(0, r'C:\Github\jail-checker\src')
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from jail_api import JailAPIClient
 from models import Defendant
 
+# "Last, First" or "Last, First Middle" in the raw response text
+NAME_RE = re.compile(r'\b[A-Z][a-z]+,\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b')
+
 print("="*80)
 print("JAIL API VERIFICATION TEST")
 print("="*80)
 
+# One client, and so one connection pool, for every request in this script;
+# closed on exit, including the early sys.exit() paths
+client = JailAPIClient()
+atexit.register(client.close)
+
 # Step 1: Get current inmates from the jail
 print("\n[Step 1] Fetching current inmates from jail...")
 
 url = "https://cc.southernsoftware.com/bookingsearch/fetchesforajax/fetch_current_confinements.php"
 
-headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-    'Content-Type': 'application/x-www-form-urlencoded',
-    'Referer': 'https://cc.southernsoftware.com/bookingsearch/index.php?AgencyID=DorchesterCoSC'
-}
-
 payload = {
     'JMSAgencyID': 'SC018013C',
     'search': '',
@@ -39,7 +42,8 @@ payload = {
     'IDX': 1
 }
 
-response = requests.post(url, headers=headers, data=payload)
+# Same keep-alive session (browser headers, retries) the custody check uses below
+response = client.session.post(url, data=payload, timeout=30)
 
 if response.status_code != 200:
     print(f"ERROR: Failed to fetch inmates. Status code: {response.status_code}")
@@ -47,8 +51,9 @@ if response.status_code != 200:
 
 print(f"✓ Successfully fetched data from jail (Status: {response.status_code})")
 
-# Step 2: Parse the response to extract inmate names
-soup = BeautifulSoup(response.text, 'html.parser')
+# Step 2: Parse the response to extract inmate names (only booking card divs
+# and table rows are searched below, so skip building the rest of the page)
+soup = BeautifulSoup(response.text, 'lxml', parse_only=SoupStrainer(['div', 'tr']))
 
 # Look for inmate cards or name elements
 # The API returns HTML with booking information
@@ -91,12 +96,13 @@ if rows and not booking_cards:
 # Pattern 3: Just look for any text with comma (name format)
 if not names:
     print("\nTrying pattern matching on raw text...")
-    import re
-    # Look for "Last, First" pattern
-    name_pattern = r'\b[A-Z][a-z]+,\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b'
-    found_names = re.findall(name_pattern, response.text)
-    if found_names:
-        names = list(set(found_names))[:10]  # Unique names, max 10
+    # Look for "Last, First" pattern; stop at 10 unique names, in page order
+    found_names = {}
+    for match in NAME_RE.finditer(response.text):
+        found_names[match.group(0)] = None
+        if len(found_names) == 10:
+            break
+    names = list(found_names)
 
 if not names:
     print("\nERROR: Could not find any inmate names in the response")
@@ -138,9 +144,7 @@ defendant = Defendant(
 
 print(f"\n[Step 4] Searching jail database for: {defendant.full_name}")
 
-client = JailAPIClient()
 result = client.check_custody(defendant)
-client.close()
 
 print("\n" + "="*80)
 print("TEST RESULTS")
@@ -26,8 +26,8 @@ try:
                 data_row = 4
 
             print(f"First data row (row {data_row}):")
-            for col in ['A', 'B', 'C', 'D']:
-                val = ws[f'{col}{data_row}'].value
+            values = next(ws.iter_rows(min_row=data_row, max_row=data_row, max_col=4, values_only=True))
+            for col, val in zip(['A', 'B', 'C', 'D'], values):
                 print(f"  {col}{data_row}: {str(val)[:40] if val else '(empty)'}")
             print()
 
@@ -2,32 +2,46 @@
 
 import openpyxl
 
-wb = openpyxl.load_workbook(r'C:\Github\jail-checker\output\Prosecutor Worklist Report_custody_20251027_160653.xlsx')
+# Read-only mode streams rows instead of building every cell up front
+wb = openpyxl.load_workbook(
+    r'C:\Github\jail-checker\output\Prosecutor Worklist Report_custody_20251027_160653.xlsx',
+    read_only=True,
+    data_only=True
+)
 ws = wb['All Results']
 
 print('=== Headers ===')
-headers = [cell.value for cell in ws[1]]
+headers = list(next(ws.iter_rows(max_row=1, values_only=True)))
 print(headers)
 print()
 
+# One pass over the sheet: read-only mode re-parses the XML on every iter_rows
+in_custody_rows = []
+murray = None
+for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
+    status = row[3]
+    if status and 'IN CUSTODY' in str(status):
+        in_custody_rows.append(row)
+        if murray is None and row_num <= 25 and 'Murray' in str(row[2]):
+            murray = row
+
 print('=== First IN CUSTODY Record (Looking for Murray) ===')
-for row in ws.iter_rows(min_row=2, max_row=25, values_only=True):
-    if row[3] and 'IN CUSTODY' in str(row[3]) and 'Murray' in str(row[2]):
-        print(f'Matter: {row[0]}')
-        print(f'Case: {row[1]}')
-        print(f'Name: {row[2]}')
-        print(f'Status: {row[3]}')
-        print(f'Booking Date: {row[4]}')
-        print(f'Booking Number: {row[5]}')
-        print(f'Charges: {row[6]}')
-        print(f'Bond: {row[7]}')
-        break
+if murray:
+    print(f'Matter: {murray[0]}')
+    print(f'Case: {murray[1]}')
+    print(f'Name: {murray[2]}')
+    print(f'Status: {murray[3]}')
+    print(f'Booking Date: {murray[4]}')
+    print(f'Booking Number: {murray[5]}')
+    print(f'Charges: {murray[6]}')
+    print(f'Bond: {murray[7]}')
 
 print()
 print('=== All IN CUSTODY records with their booking dates and bonds ===')
-for row in ws.iter_rows(min_row=2, values_only=True):
-    if row[3] and 'IN CUSTODY' in str(row[3]):
-        name = row[2]
-        booking_date = row[4]
-        bond = row[7]
-        print(f'{name:<30} | Booking: {booking_date or "MISSING":<12} | Bond: {bond or "MISSING"}')
+for row in in_custody_rows:
+    name = row[2]
+    booking_date = row[4]
+    bond = row[7]
+    print(f'{name:<30} | Booking: {booking_date or "MISSING":<12} | Bond: {bond or "MISSING"}')
+
+wb.close()
@@ -1,5 +1,7 @@
 """Check the layout of an old Excel file to understand the original structure."""
 
+from collections import defaultdict
+
 from openpyxl import load_workbook
 
 # Check the first generated file
@@ -18,18 +20,24 @@ try:
         print()
 
         # Check first 5 rows
-        for row_num in range(1, min(6, ws.max_row + 1)):
+        last_row = min(5, ws.max_row)
+
+        # Merged ranges by row, limited to the rows shown
+        merged_by_row = defaultdict(list)
+        for merged_range in ws.merged_cells.ranges:
+            for row_num in range(merged_range.min_row, min(merged_range.max_row, last_row) + 1):
+                merged_by_row[row_num].append(merged_range)
+
+        # Standard mode: merged cells are not available in read-only mode
+        rows = ws.iter_rows(max_row=last_row, max_col=min(10, ws.max_column), values_only=True)
+        for row_num, values in enumerate(rows, 1):
             print(f"Row {row_num}:")
-            row_values = []
-            for col_num in range(1, min(11, ws.max_column + 1)):
-                cell = ws.cell(row=row_num, column=col_num)
-                row_values.append(str(cell.value)[:20] if cell.value else "")
+            row_values = [str(value)[:20] if value else "" for value in values]
             print(f"  {row_values}")
 
             # Check if row is merged
-            for merged_range in ws.merged_cells.ranges:
-                if row_num >= merged_range.min_row and row_num <= merged_range.max_row:
-                    print(f"  [MERGED: {merged_range}]")
+            for merged_range in merged_by_row.get(row_num, ()):
+                print(f"  [MERGED: {merged_range}]")
             print()
 
     wb.close()
@@ -0,0 +1,162 @@
+"""
+Shared PDF word extraction for the debugging scripts in this directory.
+
+page.extract_words() is the slow part of every script here, so the words of
+each page are extracted once, saved as JSON in the user's owner-only cache
+directory, and reused until the PDF changes. A cache miss extracts the pages across worker
+processes. index_rows() gives the scripts a cheap way to
+find the other words on a case number's row.
+"""
+
+import functools
+import hashlib
+import json
+import math
+import os
+import pickle
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pdfplumber
+
+PDF = r'C:\Github\jail-checker\input\Prosecutor Worklist Report.pdf'
+
+CACHE_DIR = Path.home() / ".cache" / "jail-checker" / "debug_pdf_words"
+
+# PDFs with at least this many pages are extracted across worker processes
+PARALLEL_MIN_PAGES = 8
+
+
+def _cache_path(pdf_path: Path) -> Path:
+    """
+    Return the JSON cache file for a PDF, keyed by its path, mtime and size.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Path of the cache file (which may not exist yet)
+    """
+    stat = pdf_path.stat()
+    identity = f"{pdf_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    key = hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _extract_page_words(pdf_path: str, start: int, stop: int) -> list:
+    """
+    Extract the words of pages [start, stop) of a PDF in one open.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start: First page index (0-based)
+        stop: Page index to stop before
+
+    Returns:
+        One list of word dicts per page
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        return [page.extract_words() for page in pdf.pages[start:stop]]
+
+
+def _extract_words(pdf_path: str) -> list:
+    """
+    Extract the words of every page, splitting larger PDFs into one
+    contiguous page range per worker process.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        One list of word dicts per page, in page order
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+
+    workers = min(os.cpu_count() or 1, page_count // (PARALLEL_MIN_PAGES // 2))
+    if page_count < PARALLEL_MIN_PAGES or workers < 2:
+        return _extract_page_words(pdf_path, 0, page_count)
+
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _extract_page_words,
+            [pdf_path] * workers,
+            bounds[:-1],
+            bounds[1:]
+        )
+        return [page for chunk in chunks for page in chunk]
+
+
+@functools.lru_cache(maxsize=1)
+def load_words(pdf_path: str = PDF) -> list:
+    """
+    Return page.extract_words() for every page of a PDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        One list of word dicts per page, in page order
+    """
+    cache_path = _cache_path(Path(pdf_path))
+    try:
+        with cache_path.open('r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    # Worker processes re-import the main module on Windows, and the scripts
+    # here have no __main__ guard, so extraction runs with this file as main.
+    # Pickle only carries the result back from that child process
+    result = subprocess.run(
+        [sys.executable, __file__, str(pdf_path)],
+        stdout=subprocess.PIPE,
+        check=True
+    )
+    pages = pickle.loads(result.stdout)
+
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix('.tmp')
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(pages, f, default=float)  # default: older pdfplumber returns Decimal coordinates
+        temp_path.replace(cache_path)
+    except OSError as e:
+        print(f'Warning: could not write word cache: {e}')
+
+    return pages
+
+
+def index_rows(words: list) -> dict:
+    """
+    Index a page's words by row for same-row lookups.
+
+    Each word also goes into the neighbouring buckets, so
+    rows[math.floor(top)] holds every word within 1pt of top, in page order.
+
+    Args:
+        words: Word dicts of one page
+
+    Returns:
+        Mapping of floor(top) to the word dicts near that row
+    """
+    rows = defaultdict(list)
+    for w in words:
+        bucket = math.floor(w['top'])
+        rows[bucket - 1].append(w)
+        rows[bucket].append(w)
+        rows[bucket + 1].append(w)
+    return rows
+
+
+if __name__ == '__main__':
+    pickle.dump(
+        _extract_words(sys.argv[1]),
+        sys.stdout.buffer,
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
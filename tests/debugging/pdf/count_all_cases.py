@@ -1,54 +1,56 @@
-import pdfplumber
+from _words_cache import load_words
 import re
 
+# A case number, a dash, and the trailing digits of the last case in the range
+_RANGE_RE = re.compile(r'(\d+GS\d+)-(\d+)\Z')
+
+
 def expand_case_range(case_number):
     """
     Expand a case number range into individual case numbers.
 
+    The digits after the dash replace the same number of trailing digits of
+    the first case number.
+
     Examples:
         2025GS1801261-01265 -> [2025GS1801261, 2025GS1801262, 2025GS1801263, 2025GS1801264, 2025GS1801265]
         2023GS18-02066 -> [2023GS18-02066]
     """
-    # Check if this is a range (has two numbers separated by dash at the end)
-    match = re.match(r'(\d+GS\d+)(\d+)-(\d+)$', case_number)
+    # Most case numbers are not ranges
+    if '-' not in case_number:
+        return [case_number]
 
+    match = _RANGE_RE.match(case_number)
     if not match:
-        # Not a range, return as-is
         return [case_number]
 
-    prefix = match.group(1)
-    start_num = int(match.group(2))
-    end_num = int(match.group(3))
+    first, last_digits = match.groups()
+    width = len(last_digits)
 
-    # Generate all numbers in range
-    expanded = []
-    for num in range(start_num, end_num + 1):
-        # Pad with zeros to match original length
-        num_str = str(num).zfill(len(match.group(2)))
-        expanded.append(f"{prefix}{num_str}")
-
-    return expanded
+    # Not a range when the dash part is as long as the case's own digits
+    # (e.g. 2023GS18-02066 is a single, dashed case number)
+    if width >= len(first) - first.index('GS') - 2:
+        return [case_number]
 
+    prefix = first[:-width]
+    start_num = int(first[-width:])
+    end_num = int(last_digits)
 
-pdf = pdfplumber.open(r'C:\Github\jail-checker\input\Prosecutor Worklist Report.pdf')
+    # Generate all numbers in range, padded to the original width
+    return [f"{prefix}{num:0{width}d}" for num in range(start_num, end_num + 1)]
 
-all_case_numbers = []
 
-for page in pdf.pages:
-    words = page.extract_words()
+# Case numbers in first-seen order (a dict keeps insertion order)
+unique_cases = {}
 
+for words in load_words():
     # Find all case numbers
-    case_words = [
-        w['text'].rstrip(',') for w in words
+    unique_cases.update(
+        (w['text'].rstrip(','), None) for w in words
         if 'GS' in w['text'] and 100 < w['x0'] < 200
-    ]
-
-    all_case_numbers.extend(case_words)
-
-pdf.close()
+    )
 
-# Get unique case numbers
-unique_case_numbers = list(dict.fromkeys(all_case_numbers))
+unique_case_numbers = list(unique_cases)
 
 print(f'Unique case number entries found: {len(unique_case_numbers)}')
 
@@ -1,24 +1,28 @@
 import sys
 sys.path.insert(0, r'C:\Github\jail-checker\src')
 
-import pdfplumber
+import math
+import re
+
+from _words_cache import index_rows, load_words
 from parsers import parse_defendant_name
 
-pdf = pdfplumber.open(r'C:\Github\jail-checker\input\Prosecutor Worklist Report.pdf')
+# Any of the case years 2022-2025, anywhere in the word
+YEAR_RE = re.compile(r'202[2-5]')
 
 total_case_entries = 0
 total_defendants_extracted = 0
 failed_extractions = []
 
-for page_num, page in enumerate(pdf.pages, 1):
-    words = page.extract_words()
+for page_num, words in enumerate(load_words(), 1):
+    rows = index_rows(words)
 
     # Find case numbers
     case_words = [
         w for w in words
         if 'GS' in w['text']
         and 100 < w['x0'] < 200
-        and any(year in w['text'] for year in ['2022', '2023', '2024', '2025'])
+        and YEAR_RE.search(w['text'])
     ]
 
     total_case_entries += len(case_words)
@@ -26,7 +30,7 @@ for page_num, page in enumerate(pdf.pages, 1):
     for case in case_words:
         # Find defendant name
         defendant_words = [
-            w for w in words
+            w for w in rows[math.floor(case['top'])]
             if abs(w['top'] - case['top']) < 1
             and 210 < w['x0'] < 360
         ]
@@ -58,8 +62,6 @@ for page_num, page in enumerate(pdf.pages, 1):
 
         total_defendants_extracted += 1
 
-pdf.close()
-
 print(f'Total case number entries found: {total_case_entries}')
 print(f'Total defendants successfully extracted: {total_defendants_extracted}')
 print(f'Failed extractions: {len(failed_extractions)}')
@@ -1,12 +1,12 @@
-import pdfplumber
+import math
 
-pdf = pdfplumber.open(r'C:\Github\jail-checker\input\Prosecutor Worklist Report.pdf')
+from _words_cache import index_rows, load_words
 
 all_case_numbers = []
 case_to_defendant = {}
 
-for page_num, page in enumerate(pdf.pages, 1):
-    words = page.extract_words()
+for page_num, words in enumerate(load_words(), 1):
+    rows = index_rows(words)
 
     # Find ALL words that look like case numbers (contain GS and are in the case number column)
     potential_cases = [
@@ -25,7 +25,7 @@ for page_num, page in enumerate(pdf.pages, 1):
 
         # Try to find defendant name on same row
         defendant_words = [
-            w for w in words
+            w for w in rows[math.floor(case['top'])]
             if abs(w['top'] - case['top']) < 1
             and 210 < w['x0'] < 360
         ]
@@ -43,8 +43,6 @@ for page_num, page in enumerate(pdf.pages, 1):
                 'page': page_num
             }
 
-pdf.close()
-
 print(f'Total case numbers found: {len(all_case_numbers)}')
 print(f'Case numbers with defendant names: {sum(1 for v in case_to_defendant.values() if v["name"])}')
 print(f'Case numbers WITHOUT defendant names: {sum(1 for v in case_to_defendant.values() if not v["name"])}')
@@ -1,18 +1,22 @@
-import pdfplumber
+import math
+import re
 
-pdf = pdfplumber.open(r'C:\Github\jail-checker\input\Prosecutor Worklist Report.pdf')
+from _words_cache import index_rows, load_words
+
+# Any of the case years 2022-2025, anywhere in the word
+YEAR_RE = re.compile(r'202[2-5]')
 
 all_defendants = []
 
-for page_num, page in enumerate(pdf.pages, 1):
-    words = page.extract_words()
+for page_num, words in enumerate(load_words(), 1):
+    rows = index_rows(words)
 
     # Find case numbers (any year + GS format)
-    case_words = [w for w in words if 'GS' in w['text'] and w['x0'] > 100 and w['x0'] < 200 and any(year in w['text'] for year in ['2022', '2023', '2024', '2025'])]
+    case_words = [w for w in words if 'GS' in w['text'] and w['x0'] > 100 and w['x0'] < 200 and YEAR_RE.search(w['text'])]
 
     for case in case_words:
         # Find defendant name words on same row (x0 between 210-360)
-        defendant_words = [w for w in words if abs(w['top'] - case['top']) < 1 and 210 < w['x0'] < 360]
+        defendant_words = [w for w in rows[math.floor(case['top'])] if abs(w['top'] - case['top']) < 1 and 210 < w['x0'] < 360]
         defendant_name = ' '.join([w['text'] for w in sorted(defendant_words, key=lambda x: x['x0'])])
 
         if defendant_name:
@@ -22,8 +26,6 @@ for page_num, page in enumerate(pdf.pages, 1):
                 'page': page_num
             })
 
-pdf.close()
-
 print(f'Total defendants found: {len(all_defendants)}')
 print(f'\nFirst 10 defendants:')
 for d in all_defendants[:10]:
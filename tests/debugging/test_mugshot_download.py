@@ -3,6 +3,7 @@
 import sys
 sys.path.insert(0, r'C:\Github\jail-checker\src')
 
+import shutil
 from io import BytesIO
 import requests
 from openpyxl import Workbook
@@ -18,14 +19,19 @@ print()
 try:
     # Download image
     print("Downloading image...")
-    response = requests.get(test_url, timeout=10)
+    # Stream the body straight into the BytesIO instead of copying
+    # response.content into it
+    image_data = BytesIO()
+    with requests.get(test_url, timeout=10, stream=True) as response:
+        response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, image_data)
     print(f"Response status: {response.status_code}")
-    print(f"Content length: {len(response.content)} bytes")
+    print(f"Content length: {image_data.tell()} bytes")
     print()
 
-    # Create BytesIO and Image object
+    # Create Image object
     print("Creating Image object...")
-    image_data = BytesIO(response.content)
+    image_data.seek(0)
     img = Image(image_data)
     img.width = 100
     img.height = 125
@@ -1,5 +1,7 @@
 """Validate that mugshots are aligned with data rows."""
 
+from collections import defaultdict
+
 from openpyxl import load_workbook
 
 excel_path = r'C:\Github\jail-checker\output\Prosecutor Worklist Report_custody_20251027_165735.xlsx'
@@ -17,26 +19,35 @@ try:
         print()
 
         # Check first 7 rows
-        for row_num in range(1, min(8, ws.max_row + 1)):
+        last_row = min(7, ws.max_row)
+
+        # Merged ranges and images by row, limited to the rows shown
+        merged_by_row = defaultdict(list)
+        for merged_range in ws.merged_cells.ranges:
+            for row_num in range(merged_range.min_row, min(merged_range.max_row, last_row) + 1):
+                merged_by_row[row_num].append(merged_range)
+
+        images_by_row = defaultdict(list)
+        for img in ws._images:
+            images_by_row[img.anchor._from.row + 1].append(img)  # openpyxl uses 0-indexed internally
+
+        # Standard mode: merged cells and images are not available in
+        # read-only mode
+        rows = ws.iter_rows(max_row=last_row, max_col=min(4, ws.max_column), values_only=True)
+        for row_num, values in enumerate(rows, 1):
             print(f"Row {row_num}:")
 
             # Get first few cell values
-            row_values = []
-            for col_num in range(1, min(5, ws.max_column + 1)):
-                cell = ws.cell(row=row_num, column=col_num)
-                val = str(cell.value)[:30] if cell.value else ""
-                row_values.append(val)
+            row_values = [str(value)[:30] if value else "" for value in values]
             print(f"  Data: {row_values}")
 
             # Check for merged cells
-            for merged_range in ws.merged_cells.ranges:
-                if row_num >= merged_range.min_row and row_num <= merged_range.max_row:
-                    print(f"  [MERGED: {merged_range}]")
+            for merged_range in merged_by_row.get(row_num, ()):
+                print(f"  [MERGED: {merged_range}]")
 
             # Check for images
-            for img in ws._images:
-                if img.anchor._from.row + 1 == row_num:  # openpyxl uses 0-indexed internally
-                    print(f"  [IMAGE ANCHORED HERE]")
+            for img in images_by_row.get(row_num, ()):
+                print(f"  [IMAGE ANCHORED HERE]")
 
             print()
 
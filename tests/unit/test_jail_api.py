@@ -0,0 +1,181 @@
+"""
+Unit tests for jail_api module.
+
+Run with: python -m pytest tests/unit/test_jail_api.py -v
+Or run doctests: python -m doctest src/jail_api.py -v
+"""
+
+from unittest import mock
+
+from jail_api import JailAPIClient, MAX_PAGES
+from models import Defendant
+
+
+def test_failed_first_page_is_not_reported_as_empty():
+    """
+    Test that an HTTP error on page 1 becomes an error result, not NOT IN CUSTODY.
+    """
+    client = JailAPIClient(use_cache=False)
+    client._session_initialized = True
+    response = mock.Mock(status_code=500, content=b'')
+
+    with mock.patch.object(client.session, 'post', return_value=response) as post:
+        result = client.check_custody(Defendant(last_name="Smith", first_name="John"))
+        assert result.error_message is not None
+        assert client._current_inmates is None
+
+        # The failure is remembered rather than re-fetched for every defendant
+        client.check_custody(Defendant(last_name="Doe", first_name="Jane"))
+        assert post.call_count == 1
+
+
+BOOKING_CARD_HTML = b"""
+<div class="booking-card">
+    <h5 class="card-title">JOHN QUINCY ADAMS</h5>
+    <img class="booking-mugshot" src="mugshot.php?id=98765">
+    <div class="detail-row">
+        <span class="detail-label">
+            <i class="fa fa-calendar"></i>
+            Booked:
+        </span>
+        <span class="detail-value">10/27/2025 14:05</span>
+    </div>
+    <div class="detail-row">
+        <span class="detail-label">
+            <i class="fa fa-shield"></i>
+            Arresting Agency:
+        </span>
+        <span class="detail-value">SUMMERVILLE PD</span>
+    </div>
+    <div class="detail-row">
+        <span class="detail-label">
+            <i class="fa fa-dollar"></i>
+            Bond Total:
+        </span>
+        <span class="detail-value">$5,000.00</span>
+    </div>
+    <a href="details.php?BookingID=98765">View Full Details</a>
+</div>
+"""
+
+
+def test_parse_page_reads_indented_labels():
+    """
+    Test that booking card labels with icons and indentation are matched.
+    """
+    inmates, _ = JailAPIClient()._parse_page(1, BOOKING_CARD_HTML)
+
+    [inmate] = inmates[("adams", "john")]
+    assert inmate['full_name'] == "JOHN QUINCY ADAMS"
+    assert inmate['middle_name'] == "QUINCY"
+    assert inmate['booking_date'] == "10/27/2025 14:05"
+    assert inmate['arresting_agency'] == "SUMMERVILLE PD"
+    assert inmate['bond_amount'] == "$5,000.00"
+    assert inmate['booking_number'] == "98765"
+
+
+def test_middle_name_score():
+    """
+    Test JailAPIClient._middle_name_score ordering.
+
+    >>> JailAPIClient._middle_name_score("Q", "QUINCY")
+    2
+    """
+    score = JailAPIClient._middle_name_score
+    assert score("Quincy", "QUINCY") == 3
+    assert score("Q.", "QUINCY") == 2
+    assert score("QUINCY", "Q") == 2
+    assert score("", "QUINCY") == 1
+    assert score("Quincy", "") == 1
+    assert score("Ann", "MARIE") == 0
+    assert score("Quentin", "QUINCY") == 0
+
+
+def test_check_custody_matches_last_first_and_middle():
+    """
+    Test that custody checks match on last and first name, then prefer the best middle name.
+    """
+    client = JailAPIClient(use_cache=False)
+    second_card = BOOKING_CARD_HTML.replace(b"QUINCY", b"PAUL").replace(b"98765", b"11111")
+    client._current_inmates, _ = client._parse_page(1, BOOKING_CARD_HTML + second_card)
+
+    quincy = client.check_custody(Defendant(last_name="Adams", first_name="John", middle_name="Q."))
+    assert quincy.in_custody
+    assert quincy.booking_number == "98765"
+
+    paul = client.check_custody(Defendant(last_name=" ADAMS", first_name="john ", middle_name="Paul"))
+    assert paul.in_custody
+    assert paul.booking_number == "11111"
+
+    assert not client.check_custody(Defendant(last_name="Adams", first_name="Jane")).in_custody
+    assert not client.check_custody(Defendant(last_name="Smith", first_name="John")).in_custody
+
+
+def test_partial_confinements_are_not_cached():
+    """
+    Test that a page failing after retries keeps the partial index out of the disk cache.
+    """
+    client = JailAPIClient(use_cache=True, delay_seconds=0)
+    client._session_initialized = True
+    first_page = (
+        b'<h5 class="text-muted">Current Confinements: <span class="text-primary">2</span></h5>'
+        + BOOKING_CARD_HTML
+    )
+    responses = {
+        b'1': mock.Mock(status_code=200, content=first_page),
+        b'2': mock.Mock(status_code=500, content=b''),
+    }
+
+    def post(url, data, **kwargs):
+        return responses[data.rsplit(b'=', 1)[1]]
+
+    with mock.patch.object(client.session, 'post', side_effect=post), \
+            mock.patch.object(JailAPIClient, '_load_cached_inmates', return_value=None), \
+            mock.patch.object(JailAPIClient, '_save_cached_inmates') as save:
+        assert client.load_current_confinements() == 1
+        save.assert_not_called()
+
+
+def _serve_pages(pages_with_cards, first_page_extra=b''):
+    """
+    Build a session.post stand-in serving one booking card on each listed page.
+    """
+    requested = []
+
+    def post(url, data, **kwargs):
+        page_idx = int(data.rsplit(b'=', 1)[1])
+        requested.append(page_idx)
+        if page_idx not in pages_with_cards:
+            return mock.Mock(status_code=200, content=b'<div></div>')
+        card = BOOKING_CARD_HTML.replace(b"ADAMS", b"ADAMS%d" % page_idx)
+        return mock.Mock(status_code=200, content=(first_page_extra if page_idx == 1 else b'') + card)
+
+    return post, requested
+
+
+def test_windowed_pagination_links_keep_probing():
+    """
+    Test that a page count read from pagination links is only a starting point.
+    """
+    client = JailAPIClient(use_cache=False, delay_seconds=0)
+    client._session_initialized = True
+    links = b''.join(b'<li><a>%d</a></li>' % n for n in range(1, 6))
+    post, requested = _serve_pages(range(1, 9), b'<ul class="pagination">' + links + b'</ul>')
+
+    with mock.patch.object(client.session, 'post', side_effect=post):
+        assert client.load_current_confinements() == 8
+    # 6-25 still holds data (6-8), so probing stops after the empty batch 26-45
+    assert max(requested) == 45
+
+
+def test_batch_probe_stops_at_max_pages():
+    """
+    Test that probing without any pagination hint never requests past MAX_PAGES.
+    """
+    client = JailAPIClient(use_cache=False, delay_seconds=0)
+    client._session_initialized = True
+    post, requested = _serve_pages(range(1, 1000))
+
+    with mock.patch.object(client.session, 'post', side_effect=post):
+        assert client.load_current_confinements() == MAX_PAGES
+    assert sorted(requested) == list(range(1, MAX_PAGES + 1))
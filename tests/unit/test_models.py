@@ -5,12 +5,6 @@ Run with: python -m pytest tests/unit/test_models.py -v
 Or run doctests: python -m doctest src/models.py -v
 """
 
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
-
 from models import Defendant, CustodyResult, CustodyReport
 
 
@@ -107,17 +101,3 @@ def test_custody_report_in_custody_list():
     in_custody = report.get_in_custody_list()
     assert len(in_custody) == 1
     assert in_custody[0].defendant_name == "Smith"
-
-
-if __name__ == "__main__":
-    import doctest
-    doctest.testmod()
-
-    # Run tests
-    test_defendant_full_name()
-    test_defendant_search_name()
-    test_custody_result_status_summary()
-    test_custody_report_counts()
-    test_custody_report_in_custody_list()
-
-    print("All tests passed!")